@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+"""Microbenchmarks for creating and using small vectors in python-gsl.
+
+Run from the top of the source tree, with GSL installed:
+
+    python3 benchmarks/bench_vector.py
+
+Each line gives the best time per operation out of several runs.
+
+"""
+
+# Copyright © 2016 Timothy Pederick.
+#
+# This file is part of python-gsl.
+#
+# python-gsl is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-gsl is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with python-gsl. If not, see <http://www.gnu.org/licenses/>.
+
+# Standard library imports.
+import os
+import sys
+import timeit
+
+# Benchmark the source tree, rather than any installed copy.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir, 'src'))
+
+SETUP = """
+from gsl.vector import Vector
+u = Vector((1.0, 2.0, 3.0, 4.0))
+"""
+
+BENCHMARKS = [('Vector(4)', 'Vector(4)'),
+              ('Vector.empty(4)', 'Vector.empty(4)'),
+              ('Vector(4, typecode="C")', 'Vector(4, typecode="C")'),
+              ('Vector(tuple of 4)', 'Vector((1.0, 2.0, 3.0, 4.0))'),
+              ('len(u)', 'len(u)'),
+              ('u[2]', 'u[2]'),
+              ('u + u', 'u + u'),
+              ('u * 2.0', 'u * 2.0'),
+              ('copy of u', 'u.__copy__()')]
+
+def main(repeat=5, number=20000):
+    """Time each benchmark, and print the results."""
+    width = max(len(name) for name, _ in BENCHMARKS)
+    for name, stmt in BENCHMARKS:
+        best = min(timeit.repeat(stmt, SETUP, repeat=repeat, number=number))
+        print('{:<{}}  {:8.3f} us'.format(name, width, best / number * 1e6))
+
+if __name__ == '__main__':
+    main()
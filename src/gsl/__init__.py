@@ -23,13 +23,13 @@
 # You should have received a copy of the GNU General Public License
 # along with python-gsl. If not, see <http://www.gnu.org/licenses/>.
 
-__all__ = ['native', 'gsl_complex', 'gsl_mode_t', 'Mode',
-           'block', 'vector', 'errors', 'sf',
-           'finalize']
+__all__ = ['native', 'gsl_complex', 'gsl_complex_float', 'gsl_mode_t',
+           'Mode', 'block', 'vector', 'arena', 'lazy', 'pool', 'memory',
+           'errors', 'sf', 'finalize']
 
 # Standard library imports.
 from enum import IntEnum
-from ctypes import Structure, c_double, c_uint, c_void_p
+from ctypes import Structure, c_double, c_float, c_uint, c_void_p
 
 # Import objects from submodules that are to be available at the package level.
 from ._native import native
@@ -41,16 +41,15 @@ from .errors import exception_on_error, set_error_handler
 set_error_handler(exception_on_error)
 
 # Define GSL complex number formats.
-class gsl_complex(Structure):
-    _fields_ = [('dat', c_double * 2)]
-
+class _ComplexConversions:
+    """Conversions between GSL complex number structs and Python."""
     @classmethod
     def from_complex(cls, c):
-        """Convert a Python complex number to a gsl_complex object."""
+        """Convert a Python complex number to a GSL complex object."""
         return cls((c.real, c.imag))
 
     def __complex__(self):
-        """Convert this gsl_complex object to a Python complex number."""
+        """Convert this GSL complex object to a Python complex number."""
         return complex(*self.dat)
 
     def __eq__(self, other):
@@ -59,6 +58,12 @@ class gsl_complex(Structure):
                 all(mine == others for mine, others in zip(self.dat,
                                                            other.dat)))
 
+class gsl_complex(_ComplexConversions, Structure):
+    _fields_ = [('dat', c_double * 2)]
+
+class gsl_complex_float(_ComplexConversions, Structure):
+    _fields_ = [('dat', c_float * 2)]
+
 # Define mode (precision) specifiers.
 gsl_mode_t = c_uint
 class Mode(IntEnum):
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+
+"""Arena allocation of vectors for python-gsl.
+
+An arena carves vectors out of a single block of memory, one after
+another, instead of allocating each one separately. All of them are
+released together when the arena is reset or closed, which makes
+arenas suited to batches of temporary vectors that are all discarded at
+the same time, such as those made in each iteration of a loop.
+
+"""
+
+# Copyright © 2016 Timothy Pederick.
+#
+# Based on the GNU Scientific Library (GSL):
+#     Copyright © 1996, 1997, 1998, 1999, 2000, 2001, 2002, 2003, 2004, 2005,
+#     2006, 2007, 2008, 2009, 2010, 2011, 2012, 2013, 2014, 2015 The GSL Team.
+#
+# This file is part of python-gsl.
+#
+# python-gsl is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-gsl is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with python-gsl. If not, see <http://www.gnu.org/licenses/>.
+
+__all__ = ['Arena']
+
+# Standard library imports.
+from ctypes import addressof, memset
+
+# Third-party library imports (bundled with python-gsl).
+from . import finalize
+
+# Local imports.
+from .block import Block
+from .vector import Vector, _in_use, _itemsizes, _view_of_memory
+
+# The alignment of each vector's data in the arena, in bytes. This is enough
+# for any element type, as it is for malloc().
+ALIGNMENT = 16
+
+class Arena:
+    """A bump allocator for vectors that are released all at once."""
+    __slots__ = ('_block', '_address', '_nbytes', '_offset', '_vectors',
+                 '__weakref__')
+
+    def __init__(self, nbytes):
+        """Allocate a new arena.
+
+        Arguments:
+            nbytes -- the size of the arena's memory, in bytes. This
+                must be enough for all the vectors made from it before
+                it is reset.
+
+        """
+        if nbytes < 1:
+            raise ValueError('nbytes must be positive')
+        self._block = Block(nbytes, typecode='B', init=False)
+        self._address = addressof(self._block._block_p.contents.data.contents)
+        self._nbytes = nbytes
+        self._offset = 0
+        # Weak references to the vectors made from the arena.
+        self._vectors = finalize.WeakRegistry()
+
+    def __repr__(self):
+        if self.closed:
+            return '<closed Arena>'
+        return 'Arena({})'.format(self._nbytes)
+
+    @property
+    def nbytes(self):
+        """The size of the arena's memory, in bytes."""
+        return self._nbytes
+
+    @property
+    def used(self):
+        """The number of bytes taken by vectors since the last reset."""
+        return self._offset
+
+    @property
+    def closed(self):
+        """Whether this arena has been closed."""
+        return self._block.closed
+
+    def vector(self, size, typecode='d'):
+        """Make a new vector of zeroes from the arena's memory.
+
+        Arguments:
+            size -- the number of elements in the vector.
+            typecode -- the typecode of the vector (see Vector). The
+                default is 'd'.
+
+        Raises:
+            MemoryError -- if there isn't enough room left in the arena.
+
+        """
+        v = self.empty(size, typecode)
+        memset(v._v_p.contents.data, 0, size * _itemsizes[typecode])
+        return v
+
+    def empty(self, size, typecode='d'):
+        """Make a new vector from the arena without initialising it.
+
+        As for Vector.empty(), the elements have arbitrary values until
+        they are assigned.
+
+        """
+        if self.closed:
+            raise ValueError('operation on a closed arena')
+        itemsize = _itemsizes.get(typecode)
+        if itemsize is None:
+            raise ValueError('unknown type code {!r}'.format(typecode))
+        if size < 1:
+            raise ValueError('size must be positive')
+
+        # Bump the offset past the new vector's data.
+        start = -(-self._offset // ALIGNMENT) * ALIGNMENT
+        end = start + size * itemsize
+        if end > self._nbytes:
+            raise MemoryError('allocating {} bytes would exceed the arena '
+                              'size of {} bytes ({} in use)'.format(
+                                  end - start, self._nbytes, self._offset))
+        self._offset = end
+
+        view = _view_of_memory(typecode, self._address + start, size)
+        v = Vector._from_view(view, typecode, self)
+        self._vectors.add(v)
+        return v
+
+    def reset(self):
+        """Release all of the vectors made from the arena, and reuse it.
+
+        Any of those vectors that are still alive are closed, so that
+        they can no longer use the memory. The arena's memory itself is
+        kept for the vectors made after the reset.
+
+        Raises:
+            BufferError -- if any of those vectors can't be closed
+                because views or buffers of them are still in use. No
+                vectors are closed in that case.
+
+        """
+        if self.closed:
+            raise ValueError('operation on a closed arena')
+        vectors = [v for v in self._vectors if not v.closed]
+        for v in vectors:
+            if v._exports is not None and any(_in_use(obj)
+                                              for obj in v._exports):
+                raise BufferError('cannot reset an arena while views or '
+                                  'buffers of its vectors exist')
+        for v in vectors:
+            v.close()
+        self._vectors.clear()
+        self._offset = 0
+
+    def close(self):
+        """Release all of the vectors made from the arena, and free it.
+
+        This is as for reset(), but the arena's memory is freed as well.
+        Closing an arena that's already closed does nothing.
+
+        """
+        if self.closed:
+            return
+        self.reset()
+        self._block.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close this arena on leaving a with statement."""
+        self.close()
@@ -23,13 +23,17 @@
 # You should have received a copy of the GNU General Public License
 # along with python-gsl. If not, see <http://www.gnu.org/licenses/>.
 
-__all__ = ['alloc', 'free']
+__all__ = ['Block', 'alloc', 'free']
 
 # Standard library imports.
-from ctypes import Structure, c_double, c_size_t, POINTER
+from ctypes import (Structure, c_double, c_float, c_int, c_long, c_short,
+                    c_size_t, c_ubyte, sizeof, POINTER)
+
+# Third-party library imports (bundled with python-gsl).
+from . import finalize
 
 # Local imports.
-from . import native, gsl_complex
+from . import native, gsl_complex, gsl_complex_float, memory
 from .errors import exception_from_result
 
 # GSL_ENOMEM error code.
@@ -48,6 +52,42 @@ class gsl_block_complex(Structure):
 
 gsl_block_complex_p = POINTER(gsl_block_complex)
 
+class gsl_block_float(Structure):
+    _fields_ = [('size', c_size_t),
+                ('data', POINTER(c_float))]
+
+gsl_block_float_p = POINTER(gsl_block_float)
+
+class gsl_block_complex_float(Structure):
+    _fields_ = [('size', c_size_t),
+                ('data', POINTER(gsl_complex_float))]
+
+gsl_block_complex_float_p = POINTER(gsl_block_complex_float)
+
+class gsl_block_int(Structure):
+    _fields_ = [('size', c_size_t),
+                ('data', POINTER(c_int))]
+
+gsl_block_int_p = POINTER(gsl_block_int)
+
+class gsl_block_long(Structure):
+    _fields_ = [('size', c_size_t),
+                ('data', POINTER(c_long))]
+
+gsl_block_long_p = POINTER(gsl_block_long)
+
+class gsl_block_uchar(Structure):
+    _fields_ = [('size', c_size_t),
+                ('data', POINTER(c_ubyte))]
+
+gsl_block_uchar_p = POINTER(gsl_block_uchar)
+
+class gsl_block_short(Structure):
+    _fields_ = [('size', c_size_t),
+                ('data', POINTER(c_short))]
+
+gsl_block_short_p = POINTER(gsl_block_short)
+
 # Native function declarations.
 native.gsl_block_alloc.argtypes = (c_size_t,)
 native.gsl_block_alloc.restype = gsl_block_p
@@ -61,35 +101,204 @@ native.gsl_block_complex_alloc.restype = gsl_block_complex_p
 native.gsl_block_complex_calloc.argtypes = (c_size_t,)
 native.gsl_block_complex_calloc.restype = gsl_block_complex_p
 
+native.gsl_block_float_alloc.argtypes = (c_size_t,)
+native.gsl_block_float_alloc.restype = gsl_block_float_p
+
+native.gsl_block_float_calloc.argtypes = (c_size_t,)
+native.gsl_block_float_calloc.restype = gsl_block_float_p
+
+native.gsl_block_complex_float_alloc.argtypes = (c_size_t,)
+native.gsl_block_complex_float_alloc.restype = gsl_block_complex_float_p
+
+native.gsl_block_complex_float_calloc.argtypes = (c_size_t,)
+native.gsl_block_complex_float_calloc.restype = gsl_block_complex_float_p
+
+for suffix, block_p in (('int', gsl_block_int_p),
+                        ('long', gsl_block_long_p),
+                        ('uchar', gsl_block_uchar_p),
+                        ('short', gsl_block_short_p)):
+    for fn_name in ('alloc', 'calloc'):
+        fn = getattr(native, 'gsl_block_{}_{}'.format(suffix, fn_name))
+        fn.argtypes = (c_size_t,)
+        fn.restype = block_p
+
+def _nbytes(block_p):
+    """Find the size of a block's data, in bytes."""
+    block = block_p.contents
+    return block.size * sizeof(block.data._type_)
+
+def _itemsize(block_p_type):
+    """Find the size of a block type's elements, in bytes."""
+    return sizeof(dict(block_p_type._type_._fields_)['data']._type_)
+
 def alloc(size, typecode='d', init=False):
     """Allocate a new block of memory."""
     # Use calloc to initialise the new block, or alloc otherwise.
     alloc_fns = {'d': (native.gsl_block_alloc, native.gsl_block_calloc),
                  'C': (native.gsl_block_complex_alloc,
-                       native.gsl_block_complex_calloc)
+                       native.gsl_block_complex_calloc),
+                 'f': (native.gsl_block_float_alloc,
+                       native.gsl_block_float_calloc),
+                 'F': (native.gsl_block_complex_float_alloc,
+                       native.gsl_block_complex_float_calloc),
+                 'i': (native.gsl_block_int_alloc,
+                       native.gsl_block_int_calloc),
+                 'l': (native.gsl_block_long_alloc,
+                       native.gsl_block_long_calloc),
+                 'B': (native.gsl_block_uchar_alloc,
+                       native.gsl_block_uchar_calloc),
+                 'h': (native.gsl_block_short_alloc,
+                       native.gsl_block_short_calloc)
                  }.get(typecode)
     if alloc_fns is None:
         raise ValueError('unknown type code {!r}'.format(typecode))
 
     fn_without_init, fn_with_init = alloc_fns
 
-    block_p = (fn_with_init if init else fn_without_init)(size)
-    if not block_p:
-        # Null pointer returned; insufficient memory is available.
-        raise exception_from_result(NO_MEMORY)
-    else:
-        return block_p
+    alloc_fn = fn_with_init if init else fn_without_init
+
+    # Count the allocation first, so that going over budget fails early.
+    nbytes = size * _itemsize(alloc_fn.restype)
+    memory.record_alloc(typecode, nbytes)
+    try:
+        block_p = alloc_fn(size)
+        if not block_p:
+            # Null pointer returned; insufficient memory is available.
+            raise exception_from_result(NO_MEMORY)
+    except BaseException:
+        memory.cancel_alloc(typecode, nbytes)
+        raise
+    return block_p
 
 
 native.gsl_block_free.argtypes = (gsl_block_p,)
 native.gsl_block_complex_free.argtypes = (gsl_block_complex_p,)
+native.gsl_block_float_free.argtypes = (gsl_block_float_p,)
+native.gsl_block_complex_float_free.argtypes = (gsl_block_complex_float_p,)
+native.gsl_block_int_free.argtypes = (gsl_block_int_p,)
+native.gsl_block_long_free.argtypes = (gsl_block_long_p,)
+native.gsl_block_uchar_free.argtypes = (gsl_block_uchar_p,)
+native.gsl_block_short_free.argtypes = (gsl_block_short_p,)
 
 def free(block_p, typecode='d'):
     """Free an allocated block of memory."""
     free_fn = {'d': native.gsl_block_free,
-                'C': native.gsl_block_complex_free
+                'C': native.gsl_block_complex_free,
+                'f': native.gsl_block_float_free,
+                'F': native.gsl_block_complex_float_free,
+                'i': native.gsl_block_int_free,
+                'l': native.gsl_block_long_free,
+                'B': native.gsl_block_uchar_free,
+                'h': native.gsl_block_short_free
                 }.get(typecode)
     if free_fn is None:
         raise ValueError('unknown type code {!r}'.format(typecode))
 
+    nbytes = _nbytes(block_p)
     free_fn(block_p)
+    memory.record_free(typecode, nbytes)
+
+
+def _free_block(item):
+    """Finalizer for Block objects.
+
+    The item is a tuple of the native block pointer and its typecode.
+
+    """
+    free(*item)
+
+class Block:
+    """A block of memory, which several vectors can share.
+
+    Vectors are made from a block with Vector.from_block(). Each one
+    keeps the block alive for as long as it is itself alive.
+
+    """
+    __slots__ = ('_block_p', '_typecode', '_finalizer', '_exports',
+                 '__weakref__')
+
+    def __init__(self, size, typecode='d', init=True):
+        """Allocate a new block.
+
+        Arguments:
+            size -- the number of elements in the block.
+            typecode -- the typecode of the elements (see Vector). The
+                default is 'd'.
+            init -- whether to initialise the elements to zero. The
+                default is True.
+
+        """
+        block_p = alloc(size, typecode, init)
+        self._block_p = block_p
+        self._typecode = typecode
+        self._exports = None
+        self._finalizer = finalize.track_for_finalization(
+            self, (block_p, typecode), _free_block)
+
+    def __getattr__(self, name):
+        # As for Vector, this is only called once close() has deleted the
+        # pointer.
+        if name == '_block_p':
+            raise ValueError('operation on a closed block')
+        raise AttributeError("'{}' object has no attribute "
+                             "'{}'".format(type(self).__name__, name))
+
+    def __len__(self):
+        """Get the number of elements in this block."""
+        return self._block_p.contents.size
+
+    def __repr__(self):
+        if self.closed:
+            return '<closed Block>'
+        return 'Block({}, typecode={!r})'.format(len(self), self._typecode)
+
+    @property
+    def typecode(self):
+        """The typecode of this block's elements."""
+        return self._typecode
+
+    def _add_export(self, obj):
+        """Record a vector that uses this block's memory.
+
+        The block can't be closed while any such vector is alive.
+
+        """
+        if self._exports is None:
+            self._exports = finalize.WeakRegistry()
+        self._exports.add(obj)
+
+    @property
+    def closed(self):
+        """Whether this block has been closed."""
+        try:
+            self._block_p
+        except ValueError:
+            return True
+        else:
+            return False
+
+    def close(self):
+        """Free this block's memory now, instead of when it's collected.
+
+        Closing a block that's already closed does nothing. Blocks
+        can't be closed while vectors made from them are still in use.
+
+        """
+        if self.closed:
+            return
+        if self._exports is not None and any(not v.closed
+                                             for v in self._exports):
+            raise BufferError('cannot close a block while vectors made from '
+                              'it exist')
+
+        del self._block_p
+        self._exports = None
+        finalize.finalize_now(self._finalizer)
+        self._finalizer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close this block on leaving a with statement."""
+        self.close()
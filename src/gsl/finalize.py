@@ -4,6 +4,18 @@
 
 This is designed for avoiding __del__.
 
+Each tracked object costs one small weakref, with the item to finalize
+and its finalizer in slots. Finalizers are claimed atomically, so each
+one runs exactly once, even if the owner is collected in one thread
+while finalize_now() is called in another.
+
+Finalizers can optionally be deferred: instead of running as soon as
+their owners are collected, they are queued, and run in batches, either
+by whichever thread fills the batch or by a background thread.
+
+State that finalizers update should be guarded by a CriticalSection,
+which postpones finalizers that would otherwise wait for it forever.
+
 """
 # Copyright © 2010 Benjamin Peterson
 #
@@ -28,22 +40,21 @@ This is designed for avoiding __del__.
 # Module obtained from:
 # http://code.activestate.com/recipes/577242-calling-c-level-finalizers-without-__del__/
 
+from collections import deque
 import sys
+import threading
 import traceback
 import weakref
 
 __author__ = "Benjamin Peterson <benjamin@python.org>"
 
 class OwnerRef(weakref.ref):
-    """A simple weakref.ref subclass, so attributes can be added."""
-    pass
+    """A weakref.ref subclass, holding the item and its finalizer."""
+    __slots__ = ('item', 'finalizer')
 
 
-def _run_finalizer(ref):
-    """Internal weakref callback to run finalizers"""
-    del _finalize_refs[id(ref)]
-    finalizer = ref.finalizer
-    item = ref.item
+def _call_finalizer(finalizer, item):
+    """Call a finalizer, reporting (but not raising) any exception."""
     try:
         finalizer(item)
     except Exception:
@@ -51,8 +62,118 @@ def _run_finalizer(ref):
         traceback.print_exc()
 
 
+def _run_finalizer(ref):
+    """Internal weakref callback to run finalizers"""
+    # Removing the ref from the registry claims it, so that it only runs once.
+    if _finalize_refs.pop(id(ref), None) is None:
+        # Already run by finalize_now().
+        return
+
+    if getattr(_critical, 'depth', 0):
+        # The garbage collector has interrupted a critical section, whose
+        # lock the finalizer may need.
+        _postponed.append((ref.finalizer, ref.item))
+    else:
+        _dispatch(ref.finalizer, ref.item)
+
+
+def _dispatch(finalizer, item):
+    """Run a finalizer, or queue it if finalizers are deferred."""
+    # Read the settings once: another thread may change them meanwhile.
+    batch_size, wakeup = _batch_size, _worker_wakeup
+    if batch_size is None:
+        _call_finalizer(finalizer, item)
+    else:
+        _deferred.append((finalizer, item))
+        if len(_deferred) >= batch_size:
+            if wakeup is None:
+                flush()
+            else:
+                wakeup.set()
+
+
+class CriticalSection:
+    """A lock for state that finalizers update.
+
+    The garbage collector can run finalizers in the middle of anything
+    that allocates, including code that holds the lock, so a finalizer
+    that waited for it there would never get it. Instead, finalizers
+    that a thread collects while in any critical section are postponed
+    until it leaves the outermost one.
+    """
+    __slots__ = ('_lock',)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        # Count the section as entered before taking the lock, so that a
+        # collection in between postpones finalizers rather than have them
+        # wait for it.
+        _critical.depth = getattr(_critical, 'depth', 0) + 1
+        try:
+            self._lock.acquire()
+        except BaseException:
+            _critical.depth -= 1
+            raise
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self._lock.release()
+        _critical.depth -= 1
+        if not _critical.depth:
+            while True:
+                try:
+                    finalizer, item = _postponed.popleft()
+                except IndexError:
+                    break
+                _dispatch(finalizer, item)
+
+
+class WeakRegistry:
+    """Weak references to a collection of objects, hashable or not.
+
+    The references are kept by ID, and removed as their objects die.
+    """
+    __slots__ = ('_refs',)
+
+    def __init__(self):
+        self._refs = {}
+
+    def add(self, obj):
+        """Add a weak reference to an object."""
+        refs = self._refs
+        key = id(obj)
+        refs[key] = weakref.ref(obj, lambda _, key=key: refs.pop(key, None))
+
+    def clear(self):
+        """Forget all of the objects."""
+        self._refs.clear()
+
+    def __iter__(self):
+        """Iterate over the objects that are still alive."""
+        for obj_ref in list(self._refs.values()):
+            obj = obj_ref()
+            if obj is not None:
+                yield obj
+
+
+# Tracked refs, keyed by ID. Single dict operations are atomic, so this needs
+# no lock of its own.
 _finalize_refs = {}
 
+# Deferred finalization state: the queue of finalizers and their items, the
+# number of them to run at once (or None if finalizers are not deferred), and
+# the event that wakes the background thread (if there is one).
+_deferred = deque()
+_batch_size = None
+_worker_wakeup = None
+_state_lock = threading.Lock()
+
+# Finalizers postponed until their threads leave critical sections, and each
+# thread's depth of critical sections.
+_postponed = deque()
+_critical = threading.local()
+
 
 def track_for_finalization(owner, item, finalizer):
     """Register an object for finalization.
@@ -60,8 +181,87 @@ def track_for_finalization(owner, item, finalizer):
     ``owner`` is the the object which is responsible for ``item``.
     ``finalizer`` will be called with ``item`` as its only argument when
     ``owner`` is destroyed by the garbage collector.
+
+    Returns a handle that can be passed to ``finalize_now()``.
     """
     ref = OwnerRef(owner, _run_finalizer)
     ref.item = item
     ref.finalizer = finalizer
     _finalize_refs[id(ref)] = ref
+    return ref
+
+
+def finalize_now(ref):
+    """Run a finalizer at once, instead of when its owner is destroyed.
+
+    ``ref`` is a handle returned by ``track_for_finalization()``. The
+    finalizer is run at most once, so this does nothing if it has
+    already run, and it will not run again later. It is never deferred.
+    """
+    if _finalize_refs.pop(id(ref), None) is not None:
+        ref.finalizer(ref.item)
+
+
+def flush():
+    """Run all deferred finalizers now."""
+    while True:
+        try:
+            finalizer, item = _deferred.popleft()
+        except IndexError:
+            return
+        _call_finalizer(finalizer, item)
+
+
+def pending():
+    """Get the number of deferred finalizers waiting to run."""
+    return len(_deferred)
+
+
+def enable_deferred(batch_size=256, background=False):
+    """Defer finalizers, and run them in batches.
+
+    Finalizers of collected owners are queued, and run once
+    ``batch_size`` of them are waiting. If ``background`` is true, a
+    daemon thread runs them; otherwise, the thread that fills the batch
+    does. Memory awaiting finalization is not freed until its batch
+    runs, so call ``flush()`` to release it sooner.
+    """
+    global _batch_size, _worker_wakeup
+    if batch_size < 1:
+        raise ValueError('batch_size must be at least 1')
+
+    with _state_lock:
+        _stop_worker()
+        _batch_size = batch_size
+        if background:
+            _worker_wakeup = threading.Event()
+            threading.Thread(target=_worker, args=(_worker_wakeup,),
+                             name='gsl-finalize', daemon=True).start()
+
+
+def disable_deferred():
+    """Stop deferring finalizers, and run any that are waiting."""
+    global _batch_size
+    with _state_lock:
+        _batch_size = None
+        _stop_worker()
+    flush()
+
+
+def _stop_worker():
+    """Stop the background thread, if there is one."""
+    global _worker_wakeup
+    wakeup, _worker_wakeup = _worker_wakeup, None
+    if wakeup is not None:
+        # The thread stops once it sees that it's been replaced.
+        wakeup.set()
+
+
+def _worker(wakeup):
+    """Run deferred finalizers in the background, until replaced."""
+    while True:
+        wakeup.wait()
+        wakeup.clear()
+        flush()
+        if _worker_wakeup is not wakeup:
+            return
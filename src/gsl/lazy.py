@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+
+"""Lazy evaluation of vector expressions for python-gsl.
+
+Each arithmetic operation on vectors makes a new vector for its result,
+so an expression such as a + b + c + d makes three vectors and passes
+over memory six times. Wrapping the first operand with lazy() instead
+builds up the expression without evaluating it, and evaluate() then
+computes the whole of it in a single pass, into one vector, using BLAS
+operations where it can.
+
+Only linear expressions can be evaluated lazily: sums and differences
+of vectors, multiplied or divided by numbers, and with numbers added.
+
+"""
+
+# Copyright © 2016 Timothy Pederick.
+#
+# Based on the GNU Scientific Library (GSL):
+#     Copyright © 1996, 1997, 1998, 1999, 2000, 2001, 2002, 2003, 2004, 2005,
+#     2006, 2007, 2008, 2009, 2010, 2011, 2012, 2013, 2014, 2015 The GSL Team.
+#
+# This file is part of python-gsl.
+#
+# python-gsl is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-gsl is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with python-gsl. If not, see <http://www.gnu.org/licenses/>.
+
+__all__ = ['lazy', 'Expression']
+
+# Standard library imports.
+from numbers import Number
+
+# Local imports.
+from .vector import (Vector, _blas_fns, _common_typecode, _scalar_typecode,
+                     _set_zero_fns)
+
+# The number of elements evaluated at a time. Every vector in an expression
+# is worked through in chunks of this size, so that each chunk of the result
+# is still in the cache as all of the terms are added to it.
+CHUNK_SIZE = 4096
+
+class Expression:
+    """An unevaluated linear combination of vectors.
+
+    Expressions are made by lazy(), and combined with vectors, numbers
+    and other expressions by the +, - and unary - operators, and with
+    numbers by the * and / operators. Nothing is computed until
+    evaluate() is called.
+
+    """
+    __slots__ = ('_terms', '_constant', '_size')
+
+    def __init__(self, terms, constant=0):
+        """Create an expression.
+
+        Arguments:
+            terms -- a list of pairs of a coefficient and a vector. The
+                vectors must all have the same length.
+            constant -- a number to add to every element. The default
+                is 0.
+
+        """
+        self._terms = terms
+        self._constant = constant
+        self._size = len(terms[0][1])
+
+    def __len__(self):
+        """Get the length of the vector that the expression evaluates to."""
+        return self._size
+
+    def __repr__(self):
+        terms = ' + '.join('{!r}*<Vector {}>'.format(coeff, id(v))
+                           for coeff, v in self._terms)
+        if self._constant:
+            terms += ' + {!r}'.format(self._constant)
+        return '<Expression {}>'.format(terms)
+
+    def _operand_terms(self, other):
+        """Get the terms and constant of another operand, if it has any."""
+        if isinstance(other, Expression):
+            terms, constant = other._terms, other._constant
+        elif isinstance(other, Vector):
+            terms, constant = [(1, other)], 0
+        elif isinstance(other, Number):
+            return [], other
+        else:
+            return None, None
+
+        if len(terms[0][1]) != self._size:
+            raise TypeError('vectors must have the same length')
+        return terms, constant
+
+    def _scaled(self, factor):
+        """Multiply this expression by a number."""
+        return Expression([(coeff * factor, v) for coeff, v in self._terms],
+                          self._constant * factor)
+
+    def __add__(self, other):
+        terms, constant = self._operand_terms(other)
+        if terms is None:
+            return NotImplemented
+        return Expression(self._terms + terms, self._constant + constant)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        terms, constant = self._operand_terms(other)
+        if terms is None:
+            return NotImplemented
+        return Expression(self._terms + [(-coeff, v) for coeff, v in terms],
+                          self._constant - constant)
+
+    def __rsub__(self, other):
+        return (-self).__add__(other)
+
+    def __neg__(self):
+        return self._scaled(-1)
+
+    def __pos__(self):
+        return self
+
+    def __mul__(self, other):
+        if not isinstance(other, Number):
+            # Products of vectors aren't linear.
+            return NotImplemented
+        return self._scaled(other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if not isinstance(other, Number):
+            return NotImplemented
+        return self._scaled(1 / other)
+
+    def typecode(self):
+        """Find the typecode of the vector that the expression evaluates to.
+
+        This is the typecode that evaluating the same expression eagerly
+        would give.
+
+        """
+        typecode = _common_typecode(*(v._typecode for _, v in self._terms))
+        for val in [coeff for coeff, _ in self._terms] + [self._constant]:
+            typecode = _common_typecode(typecode,
+                                        _scalar_typecode(typecode, val))
+        return typecode
+
+    def _combined_terms(self):
+        """Merge the terms of the same vector, and drop zero terms."""
+        coeffs = {}
+        vectors = {}
+        for coeff, v in self._terms:
+            # Vectors aren't hashable, so they're keyed by ID.
+            key = id(v)
+            coeffs[key] = coeffs.get(key, 0) + coeff
+            vectors[key] = v
+        return [(coeffs[key], vectors[key]) for key in vectors
+                if coeffs[key] != 0]
+
+    def evaluate(self, out=None):
+        """Compute the value of the expression.
+
+        The result is computed a chunk at a time. For each chunk, the
+        first vector is copied into the result and scaled, and then the
+        others are added to it with the BLAS axpy operation, or (for
+        integer vectors, which have no BLAS operations) with GSL's
+        vector functions.
+
+        Arguments:
+            out -- a vector to write the result into (optional). It must
+                have the same length as the expression, and the typecode
+                of the result (see typecode()). It may be one of the
+                vectors in the expression, but must not otherwise share
+                memory with them.
+
+        Returns:
+            The vector holding the result.
+
+        """
+        typecode = self.typecode()
+        terms = self._combined_terms()
+
+        if out is None:
+            out = Vector.empty(self._size, typecode=typecode)
+        else:
+            if not isinstance(out, Vector):
+                raise TypeError('out must be a Vector, not '
+                                '{}'.format(type(out).__name__))
+            if out._typecode != typecode:
+                raise TypeError('out must have typecode {!r} to hold the '
+                                'result'.format(typecode))
+            if len(out) != self._size:
+                raise TypeError('vectors must have the same length')
+            # Start with the destination's own term, so that it's scaled in
+            # place before anything else is written over it.
+            terms.sort(key=lambda term: term[1] is not out)
+
+        has_blas = typecode in _blas_fns
+        scratch = None
+        for start in range(0, self._size, CHUNK_SIZE):
+            chunk = slice(start, min(start + CHUNK_SIZE, self._size))
+            dest = out[chunk]
+
+            if not terms:
+                # Everything cancelled out.
+                _set_zero_fns[typecode](dest)
+            for i, (coeff, v) in enumerate(terms):
+                if i == 0:
+                    if v is not out:
+                        dest.copy_from(v[chunk])
+                    if coeff != 1:
+                        dest.scale(coeff)
+                elif has_blas:
+                    dest.axpy(coeff, v[chunk])
+                elif coeff == 1:
+                    dest += v[chunk]
+                elif coeff == -1:
+                    dest -= v[chunk]
+                else:
+                    # Scale a copy of the chunk, and add that.
+                    if scratch is None:
+                        scratch = Vector.empty(min(CHUNK_SIZE, self._size),
+                                               typecode=typecode)
+                    scaled = scratch[:len(dest)]
+                    scaled.copy_from(v[chunk])
+                    scaled.scale(coeff)
+                    dest += scaled
+
+            if self._constant:
+                dest += self._constant
+
+        return out
+
+def lazy(vector):
+    """Start a lazily evaluated expression with a vector.
+
+    For example, lazy(a) + b + c + d is an Expression that can be
+    evaluated in one pass, without making any intermediate vectors.
+
+    """
+    if not isinstance(vector, Vector):
+        raise TypeError('expected a Vector, not '
+                        '{}'.format(type(vector).__name__))
+    return Expression([(1, vector)])
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+
+"""Accounting of native memory allocated by python-gsl.
+
+The memory of vectors and blocks is counted as it is allocated and
+freed natively, so the figures here include memory held by the vector
+pool (see gsl.pool) and memory awaiting deferred freeing (see
+gsl.finalize), but not memory shared by views or mapped from files.
+Sizes count the elements' data, not GSL's own bookkeeping structs.
+
+A budget can be set on the memory allocated, so that allocations that
+would exceed it raise a MemoryError before any native memory is
+requested, rather than leaving the operating system to deal with
+running out. Each thread can also be given a budget of its own for the
+vectors that it creates.
+
+"""
+
+# Copyright © 2016 Timothy Pederick.
+#
+# Based on the GNU Scientific Library (GSL):
+#     Copyright © 1996, 1997, 1998, 1999, 2000, 2001, 2002, 2003, 2004, 2005,
+#     2006, 2007, 2008, 2009, 2010, 2011, 2012, 2013, 2014, 2015 The GSL Team.
+#
+# This file is part of python-gsl.
+#
+# python-gsl is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-gsl is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with python-gsl. If not, see <http://www.gnu.org/licenses/>.
+
+__all__ = ['stats', 'reset', 'set_budget', 'get_budget',
+           'set_thread_budget', 'get_thread_budget', 'thread_bytes']
+
+# Standard library imports.
+import threading
+
+# Third-party library imports (bundled with python-gsl).
+from . import finalize
+
+# Bytes of native memory currently allocated, and the most there has been.
+_current_bytes = 0
+_peak_bytes = 0
+# Numbers of native objects currently allocated, by typecode.
+_live = {}
+# Numbers of native allocations and frees.
+_allocs = 0
+_frees = 0
+# The most bytes that may be allocated at once, or None for no limit.
+_budget = None
+# Per-thread budgets, if any, are kept in an _Account for each thread.
+_thread = threading.local()
+# Memory can be freed in any thread, so guard the state above with a lock.
+# Since memory is freed by finalizers, which the garbage collector may run
+# while the lock is held, it must be a finalize.CriticalSection.
+_lock = finalize.CriticalSection()
+
+class _Account:
+    """The bytes of vectors charged to a thread, and its limit on them."""
+    __slots__ = ('limit', 'used')
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+
+def _over_budget(nbytes, used, limit):
+    """Make the error for an allocation that would exceed a budget."""
+    return MemoryError('allocating {} bytes would exceed the memory budget '
+                       'of {} bytes ({} in use)'.format(nbytes, limit, used))
+
+def record_alloc(typecode, nbytes):
+    """Count a native allocation of nbytes bytes for the given typecode.
+
+    This should be called before the native allocation is made, so that
+    allocations that would exceed the budget never reach the native
+    allocator. If the native allocation then fails, it should be
+    uncounted with cancel_alloc().
+
+    Raises:
+        MemoryError -- if the allocation would exceed the budget.
+
+    """
+    global _current_bytes, _peak_bytes, _allocs
+    with _lock:
+        if _budget is not None and _current_bytes + nbytes > _budget:
+            raise _over_budget(nbytes, _current_bytes, _budget)
+        _current_bytes += nbytes
+        if _current_bytes > _peak_bytes:
+            _peak_bytes = _current_bytes
+        _live[typecode] = _live.get(typecode, 0) + 1
+        _allocs += 1
+
+def cancel_alloc(typecode, nbytes):
+    """Uncount an allocation that failed after record_alloc() was called."""
+    global _current_bytes, _allocs
+    with _lock:
+        _current_bytes -= nbytes
+        _live[typecode] = _live.get(typecode, 0) - 1
+        _allocs -= 1
+
+def record_free(typecode, nbytes):
+    """Count the native freeing of nbytes bytes for the given typecode."""
+    global _current_bytes, _frees
+    with _lock:
+        _current_bytes -= nbytes
+        _live[typecode] = _live.get(typecode, 0) - 1
+        _frees += 1
+
+def charge(nbytes):
+    """Charge nbytes bytes to the current thread's budget, if it has one.
+
+    Returns:
+        The thread's account, to be passed to uncharge() when the memory
+        is released (which may happen in another thread), or None if the
+        thread has no budget.
+
+    Raises:
+        MemoryError -- if the thread's budget would be exceeded.
+
+    """
+    account = getattr(_thread, 'account', None)
+    if account is None:
+        return None
+    with _lock:
+        if account.used + nbytes > account.limit:
+            raise _over_budget(nbytes, account.used, account.limit)
+        account.used += nbytes
+    return account
+
+def uncharge(account, nbytes):
+    """Give back nbytes bytes charged to a thread's account by charge()."""
+    if account is not None:
+        with _lock:
+            account.used -= nbytes
+
+def set_budget(nbytes):
+    """Set a limit on the native memory that python-gsl may allocate.
+
+    Allocations that would take the total over the limit raise a
+    MemoryError before any native memory is requested. Memory that is
+    already allocated is not affected, even if it is over the limit.
+
+    Arguments:
+        nbytes -- the most bytes that may be allocated at once, or None
+            to remove the limit.
+
+    """
+    global _budget
+    if nbytes is not None and nbytes < 0:
+        raise ValueError('nbytes must not be negative')
+    with _lock:
+        _budget = nbytes
+
+def get_budget():
+    """Get the limit on native memory, or None if there is no limit."""
+    return _budget
+
+def set_thread_budget(nbytes):
+    """Set a limit on the vector memory that the current thread may hold.
+
+    Vectors created by this thread are charged to its budget, and
+    creating one that would take it over the limit raises a
+    MemoryError. The charge is the memory allocated for their
+    elements (which, with pooling enabled, can be more than they use),
+    and is given back when they are closed or collected, in whatever
+    thread that happens. Vectors created before the budget was set are
+    not charged.
+
+    Arguments:
+        nbytes -- the most bytes of vectors that this thread may hold at
+            once, or None to remove its limit.
+
+    """
+    if nbytes is None:
+        _thread.account = None
+        return
+    if nbytes < 0:
+        raise ValueError('nbytes must not be negative')
+    account = getattr(_thread, 'account', None)
+    if account is None:
+        _thread.account = _Account(nbytes)
+    else:
+        with _lock:
+            account.limit = nbytes
+
+def get_thread_budget():
+    """Get the current thread's limit, or None if it has no limit."""
+    account = getattr(_thread, 'account', None)
+    return None if account is None else account.limit
+
+def thread_bytes():
+    """Get the bytes charged to the current thread's budget.
+
+    This is 0 if the thread has no budget.
+
+    """
+    account = getattr(_thread, 'account', None)
+    return 0 if account is None else account.used
+
+def stats():
+    """Get a snapshot of the native memory allocated by python-gsl.
+
+    Returns:
+        A dict with these keys:
+            current_bytes -- the number of bytes allocated now.
+            peak_bytes -- the largest number of bytes allocated at any
+                one time (since the last reset()).
+            live -- a dict of the number of vectors and blocks
+                allocated now, by typecode.
+            allocs -- the number of allocations (since the last
+                reset()).
+            frees -- the number of frees (since the last reset()).
+
+    """
+    with _lock:
+        return {'current_bytes': _current_bytes,
+                'peak_bytes': _peak_bytes,
+                'live': {typecode: count for typecode, count in _live.items()
+                         if count},
+                'allocs': _allocs,
+                'frees': _frees}
+
+def reset():
+    """Reset the peak and the allocation and free counts.
+
+    The peak starts again from the memory allocated now. The current
+    memory and live objects are unaffected, since they are still
+    allocated.
+
+    """
+    global _peak_bytes, _allocs, _frees
+    with _lock:
+        _peak_bytes = _current_bytes
+        _allocs = 0
+        _frees = 0
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+
+"""Pooling of freed vector memory for python-gsl.
+
+Programs that create and discard many vectors of the same size spend
+much of their time in the native memory allocator. When pooling is
+enabled, the memory of vectors that are garbage collected is kept in
+free lists, one for each typecode and size class, instead of being
+freed, and new vectors take their memory from those lists when they
+can. The total size of the memory kept is limited by a byte cap.
+
+Pooling is off by default.
+
+"""
+
+# Copyright © 2016 Timothy Pederick.
+#
+# Based on the GNU Scientific Library (GSL):
+#     Copyright © 1996, 1997, 1998, 1999, 2000, 2001, 2002, 2003, 2004, 2005,
+#     2006, 2007, 2008, 2009, 2010, 2011, 2012, 2013, 2014, 2015 The GSL Team.
+#
+# This file is part of python-gsl.
+#
+# python-gsl is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-gsl is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with python-gsl. If not, see <http://www.gnu.org/licenses/>.
+
+__all__ = ['enable', 'disable', 'clear', 'is_enabled', 'held_bytes']
+
+# Standard library imports.
+import threading
+
+# Third-party library imports (bundled with python-gsl).
+from . import finalize
+
+# Local imports.
+from . import memory
+
+# Default limit on the memory held by the pool, in bytes.
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Free lists, keyed by typecode and size class. Each entry is a tuple of the
+# native object, the function to free it with, its size in bytes, and its
+# typecode.
+_freelists = {}
+_held_bytes = 0
+# The limit on the memory held by the pool, or None if pooling is disabled.
+_max_bytes = None
+# Finalizers can run in any thread, so guard the state above with a lock.
+# They can also run while it is held, if the garbage collector runs then, so
+# it must be a finalize.CriticalSection.
+_lock = finalize.CriticalSection()
+
+def _size_class(size):
+    """Find the size class of vectors with the given number of elements.
+
+    Size classes are powers of two: vectors in class k can hold at
+    least 2**k elements.
+
+    """
+    return (size - 1).bit_length()
+
+def alloc_size(size, itemsize):
+    """Find the number of elements to allocate for a new vector.
+
+    While pooling is enabled, vectors are allocated with room for the
+    whole of their size class, so that they can be reused by any
+    vector in that class. Vectors too big for the pool to hold are
+    allocated at their own size, since rounding them up would only
+    waste memory.
+
+    Arguments:
+        size -- the number of elements in the vector.
+        itemsize -- the size of each element, in bytes.
+
+    """
+    if _max_bytes is None or size <= 0:
+        return size
+    capacity = 1 << _size_class(size)
+    return capacity if capacity * itemsize <= _max_bytes else size
+
+def acquire(typecode, size):
+    """Take a native object from the pool, if one is available.
+
+    Returns:
+        A native object with room for at least size elements of the
+        given typecode, or None if there are none in the pool.
+
+    """
+    global _held_bytes
+    if _max_bytes is None or size <= 0:
+        return None
+
+    with _lock:
+        freelist = _freelists.get((typecode, _size_class(size)))
+        if not freelist:
+            return None
+        item, _, nbytes, _ = freelist.pop()
+        _held_bytes -= nbytes
+    return item
+
+def release(typecode, capacity, item, free_fn, nbytes):
+    """Return a native object to the pool, or free it if it won't fit.
+
+    Objects are freed through here whether pooling is enabled or not,
+    so that the memory is accounted for in gsl.memory.
+
+    Arguments:
+        typecode -- the typecode of the object's elements.
+        capacity -- the number of elements that the object has room
+            for.
+        item -- the native object.
+        free_fn -- the function to call to free the object.
+        nbytes -- the size of the object's memory, in bytes.
+
+    """
+    global _held_bytes
+    with _lock:
+        if (_max_bytes is not None and capacity > 0 and
+            _held_bytes + nbytes <= _max_bytes):
+            # Objects can be reused by vectors in any class up to their
+            # capacity.
+            size_class = capacity.bit_length() - 1
+            _freelists.setdefault((typecode, size_class), []).append(
+                (item, free_fn, nbytes, typecode))
+            _held_bytes += nbytes
+            return
+
+    free_fn(item)
+    memory.record_free(typecode, nbytes)
+
+def enable(max_bytes=DEFAULT_MAX_BYTES):
+    """Turn on pooling, or change the limit on the memory held.
+
+    Arguments:
+        max_bytes -- the most memory, in bytes, that the pool will
+            hold at once. The default is 64 MiB.
+
+    """
+    global _max_bytes
+    if max_bytes < 0:
+        raise ValueError('max_bytes must not be negative')
+    with _lock:
+        _max_bytes = max_bytes
+    _trim(max_bytes)
+
+def disable():
+    """Turn off pooling, and free all of the memory held by the pool."""
+    global _max_bytes
+    with _lock:
+        _max_bytes = None
+    _trim(0)
+
+def clear():
+    """Free all of the memory held by the pool, but leave pooling on."""
+    _trim(0)
+
+def is_enabled():
+    """Test whether pooling is turned on."""
+    return _max_bytes is not None
+
+def held_bytes():
+    """Find the amount of memory held by the pool, in bytes."""
+    return _held_bytes
+
+def _trim(max_bytes):
+    """Free memory held by the pool until it holds at most max_bytes."""
+    global _held_bytes
+    to_free = []
+    with _lock:
+        for key in list(_freelists):
+            freelist = _freelists[key]
+            while freelist and _held_bytes > max_bytes:
+                entry = freelist.pop()
+                _held_bytes -= entry[2]
+                to_free.append(entry)
+            if not freelist:
+                del _freelists[key]
+
+    # Free outside the lock, since it's not needed for that.
+    for item, free_fn, nbytes, typecode in to_free:
+        free_fn(item)
+        memory.record_free(typecode, nbytes)
@@ -23,25 +23,44 @@
 # You should have received a copy of the GNU General Public License
 # along with python-gsl. If not, see <http://www.gnu.org/licenses/>.
 
-__all__ = ['Vector']
+__all__ = ['Vector', 'add', 'sub', 'mul', 'div']
 
 # Standard library imports.
-from ctypes import (ArgumentError, Structure, c_double, c_int, c_size_t,
-                    pointer, POINTER)
+from ctypes import (Structure, c_char, c_double, c_float, c_int, c_long,
+                    c_short, c_size_t, c_ubyte, c_void_p, byref, cast,
+                    memmove, memset, pointer, sizeof, POINTER)
 try:
     # Python 3.3+
     from collections.abc import Iterable, Sequence
 except ImportError:
     # Python 3.2 and earlier
     from collections import Iterable, Sequence
-from numbers import Real
+from array import array
+from cmath import isinf
+from collections import namedtuple
+from itertools import starmap
+from math import isfinite
+import mmap
+from numbers import Integral, Number, Real
+from operator import neg
+import os
+try:
+    # Python 3.8+
+    from pickle import PickleBuffer
+except ImportError:
+    # Python 3.7 and earlier (which don't support pickle protocol 5 anyway)
+    PickleBuffer = None
+import sys
 
 # Third-party library imports (bundled with python-gsl).
 from . import finalize
 
 # Local imports.
-from . import native, gsl_complex
-from .block import gsl_block_p, gsl_block_complex_p
+from . import native, gsl_complex, gsl_complex_float, memory, pool
+from .block import (Block, gsl_block_p, gsl_block_complex_p,
+                    gsl_block_float_p, gsl_block_complex_float_p,
+                    gsl_block_int_p, gsl_block_long_p, gsl_block_uchar_p,
+                    gsl_block_short_p)
 from .errors import exception_from_result
 
 # GSL_ENOMEM error code.
@@ -69,6 +88,271 @@ class gsl_vector_complex(Structure):
 
 gsl_vector_complex_p = POINTER(gsl_vector_complex)
 
+c_float_p = POINTER(c_float)
+
+class gsl_vector_float(Structure):
+    _fields_ = [('size', c_size_t),
+                ('stride', c_size_t),
+                ('data', c_float_p),
+                ('block', gsl_block_float_p),
+                ('owner', c_int)]
+
+gsl_vector_float_p = POINTER(gsl_vector_float)
+
+gsl_complex_float_p = POINTER(gsl_complex_float)
+
+class gsl_vector_complex_float(Structure):
+    _fields_ = [('size', c_size_t),
+                ('stride', c_size_t),
+                ('data', gsl_complex_float_p),
+                ('block', gsl_block_complex_float_p),
+                ('owner', c_int)]
+
+gsl_vector_complex_float_p = POINTER(gsl_vector_complex_float)
+
+class gsl_vector_int(Structure):
+    _fields_ = [('size', c_size_t),
+                ('stride', c_size_t),
+                ('data', POINTER(c_int)),
+                ('block', gsl_block_int_p),
+                ('owner', c_int)]
+
+gsl_vector_int_p = POINTER(gsl_vector_int)
+
+class gsl_vector_long(Structure):
+    _fields_ = [('size', c_size_t),
+                ('stride', c_size_t),
+                ('data', POINTER(c_long)),
+                ('block', gsl_block_long_p),
+                ('owner', c_int)]
+
+gsl_vector_long_p = POINTER(gsl_vector_long)
+
+class gsl_vector_uchar(Structure):
+    _fields_ = [('size', c_size_t),
+                ('stride', c_size_t),
+                ('data', POINTER(c_ubyte)),
+                ('block', gsl_block_uchar_p),
+                ('owner', c_int)]
+
+gsl_vector_uchar_p = POINTER(gsl_vector_uchar)
+
+class gsl_vector_short(Structure):
+    _fields_ = [('size', c_size_t),
+                ('stride', c_size_t),
+                ('data', POINTER(c_short)),
+                ('block', gsl_block_short_p),
+                ('owner', c_int)]
+
+gsl_vector_short_p = POINTER(gsl_vector_short)
+
+# Memory layout of vector elements, for exporting them as buffers: the ctypes
+# scalar type, and the number of scalars that make up each element.
+_element_layouts = {'d': (c_double, 1),
+                    'C': (c_double, 2),
+                    'f': (c_float, 1),
+                    'F': (c_float, 2),
+                    'i': (c_int, 1),
+                    'l': (c_long, 1),
+                    'B': (c_ubyte, 1),
+                    'h': (c_short, 1)}
+
+# Sizes of vector elements, in bytes.
+_itemsizes = {typecode: sizeof(scalar_type) * parts
+              for typecode, (scalar_type, parts) in _element_layouts.items()}
+
+# Typecodes of vectors of integers.
+_integer_typecodes = frozenset('ilBh')
+
+# Array interface type strings (as used by NumPy) for each typecode.
+_byte_order = '<' if sys.byteorder == 'little' else '>'
+_array_typestrs = {'d': _byte_order + 'f8',
+                   'C': _byte_order + 'c16',
+                   'f': _byte_order + 'f4',
+                   'F': _byte_order + 'c8',
+                   'i': _byte_order + 'i{}'.format(sizeof(c_int)),
+                   'l': _byte_order + 'i{}'.format(sizeof(c_long)),
+                   'B': '|u1',
+                   'h': _byte_order + 'i{}'.format(sizeof(c_short))}
+
+# Buffer formats that can be copied directly into a vector of a given typecode.
+_buffer_typecodes = {'d': 'd',
+                     'Zd': 'C',
+                     'f': 'f',
+                     'Zf': 'F',
+                     'i': 'i',
+                     'l': 'l',
+                     'B': 'B',
+                     'h': 'h'}
+
+def _buffer_for_init(obj, typecode=None):
+    """Get a buffer that a new vector can be initialised from in bulk.
+
+    If obj supports the buffer protocol, is one-dimensional, and its
+    format is compatible with the given typecode (or implies one, if
+    typecode is None), the return value is a tuple of the typecode and
+    a contiguous, unsigned byte memoryview of the data. Otherwise, the
+    return value is None.
+
+    """
+    try:
+        view = memoryview(obj)
+    except TypeError:
+        return None
+    if view.ndim != 1:
+        # Buffers of other shapes (such as complex vectors' own buffers)
+        # can't be copied as a flat run of elements.
+        return None
+
+    # Native byte order is the only kind that can be copied directly.
+    buffer_format = view.format.lstrip('@=' + _byte_order)
+    buffer_typecode = _buffer_typecodes.get(buffer_format)
+    if buffer_typecode is None or typecode not in (None, buffer_typecode):
+        # Other formats, such as signed chars, have no matching typecode.
+        return None
+
+    if not view.c_contiguous:
+        view = memoryview(view.tobytes())
+    return buffer_typecode, view.cast('B')
+
+def _buffer_source(view):
+    """Get something that ctypes can pass as a pointer to a buffer's data."""
+    if not view.readonly:
+        return (c_char * view.nbytes).from_buffer(view)
+    elif isinstance(view.obj, bytes) and len(view.obj) == view.nbytes:
+        # Bytes objects can be passed directly, without making a copy.
+        return view.obj
+    else:
+        return view.tobytes()
+
+class gsl_vector_view(Structure):
+    _fields_ = [('vector', gsl_vector)]
+
+class gsl_vector_complex_view(Structure):
+    _fields_ = [('vector', gsl_vector_complex)]
+
+class gsl_vector_float_view(Structure):
+    _fields_ = [('vector', gsl_vector_float)]
+
+class gsl_vector_complex_float_view(Structure):
+    _fields_ = [('vector', gsl_vector_complex_float)]
+
+class gsl_vector_int_view(Structure):
+    _fields_ = [('vector', gsl_vector_int)]
+
+class gsl_vector_long_view(Structure):
+    _fields_ = [('vector', gsl_vector_long)]
+
+class gsl_vector_uchar_view(Structure):
+    _fields_ = [('vector', gsl_vector_uchar)]
+
+class gsl_vector_short_view(Structure):
+    _fields_ = [('vector', gsl_vector_short)]
+
+def _declare_real_vector_fns(prefix, vector_p, view_type, scalar_type):
+    """Declare the native functions for a type of real vector.
+
+    Arguments:
+        prefix -- the common prefix of the native function names, such
+            as 'gsl_vector_float'.
+        vector_p -- the ctypes type of pointers to the vector struct.
+        view_type -- the ctypes type of the vector view struct.
+        scalar_type -- the ctypes type of the vector's elements.
+
+    """
+    def fn(name):
+        return getattr(native, prefix + '_' + name)
+
+    for name in ('alloc', 'calloc'):
+        fn(name).argtypes = (c_size_t,)
+        fn(name).restype = vector_p
+    fn('free').argtypes = (vector_p,)
+
+    fn('get').argtypes = (vector_p, c_size_t)
+    fn('get').restype = scalar_type
+    fn('set').argtypes = (vector_p, c_size_t, scalar_type)
+    fn('set').restype = None
+
+    for name in ('memcpy', 'add', 'sub', 'mul', 'div'):
+        fn(name).argtypes = (vector_p, vector_p)
+        fn(name).restype = c_int
+    for name in ('scale', 'add_constant'):
+        fn(name).argtypes = (vector_p, scalar_type)
+        fn(name).restype = c_int
+    fn('set_zero').argtypes = (vector_p,)
+    fn('set_zero').restype = None
+
+    fn('subvector').argtypes = (vector_p, c_size_t, c_size_t)
+    fn('subvector').restype = view_type
+    fn('subvector_with_stride').argtypes = (vector_p, c_size_t, c_size_t,
+                                            c_size_t)
+    fn('subvector_with_stride').restype = view_type
+
+    for name in ('sum', 'min', 'max'):
+        fn(name).argtypes = (vector_p,)
+        fn(name).restype = scalar_type
+    fn('minmax').argtypes = (vector_p, POINTER(scalar_type),
+                             POINTER(scalar_type))
+    fn('minmax').restype = None
+    for name in ('min_index', 'max_index'):
+        fn(name).argtypes = (vector_p,)
+        fn(name).restype = c_size_t
+    for name in ('isnull', 'ispos'):
+        fn(name).argtypes = (vector_p,)
+        fn(name).restype = c_int
+
+_declare_real_vector_fns('gsl_vector_float', gsl_vector_float_p,
+                         gsl_vector_float_view, c_float)
+for fn_name in ('alloc', 'calloc'):
+    fn = getattr(native, 'gsl_vector_complex_float_' + fn_name)
+    fn.argtypes = (c_size_t,)
+    fn.restype = gsl_vector_complex_float_p
+native.gsl_vector_complex_float_free.argtypes = (gsl_vector_complex_float_p,)
+
+native.gsl_vector_complex_float_get.argtypes = (gsl_vector_complex_float_p,
+                                                c_size_t)
+native.gsl_vector_complex_float_get.restype = gsl_complex_float
+native.gsl_vector_complex_float_set.argtypes = (gsl_vector_complex_float_p,
+                                                c_size_t, gsl_complex_float)
+native.gsl_vector_complex_float_set.restype = None
+
+for fn_name in ('memcpy', 'add', 'sub', 'mul', 'div'):
+    fn = getattr(native, 'gsl_vector_complex_float_' + fn_name)
+    fn.argtypes = (gsl_vector_complex_float_p, gsl_vector_complex_float_p)
+    fn.restype = c_int
+for fn_name in ('scale', 'add_constant'):
+    fn = getattr(native, 'gsl_vector_complex_float_' + fn_name)
+    fn.argtypes = (gsl_vector_complex_float_p, gsl_complex_float)
+    fn.restype = c_int
+
+native.gsl_vector_complex_float_subvector.argtypes = (
+    gsl_vector_complex_float_p, c_size_t, c_size_t)
+native.gsl_vector_complex_float_subvector.restype = (
+    gsl_vector_complex_float_view)
+native.gsl_vector_complex_float_subvector_with_stride.argtypes = (
+    gsl_vector_complex_float_p, c_size_t, c_size_t, c_size_t)
+native.gsl_vector_complex_float_subvector_with_stride.restype = (
+    gsl_vector_complex_float_view)
+
+native.gsl_vector_complex_float_real.argtypes = (gsl_vector_complex_float_p,)
+native.gsl_vector_complex_float_real.restype = gsl_vector_float_view
+native.gsl_vector_complex_float_imag.argtypes = (gsl_vector_complex_float_p,)
+native.gsl_vector_complex_float_imag.restype = gsl_vector_float_view
+
+for fn_name in ('isnull', 'ispos'):
+    fn = getattr(native, 'gsl_vector_complex_float_' + fn_name)
+    fn.argtypes = (gsl_vector_complex_float_p,)
+    fn.restype = c_int
+
+_declare_real_vector_fns('gsl_vector_int', gsl_vector_int_p,
+                         gsl_vector_int_view, c_int)
+_declare_real_vector_fns('gsl_vector_long', gsl_vector_long_p,
+                         gsl_vector_long_view, c_long)
+_declare_real_vector_fns('gsl_vector_uchar', gsl_vector_uchar_p,
+                         gsl_vector_uchar_view, c_ubyte)
+_declare_real_vector_fns('gsl_vector_short', gsl_vector_short_p,
+                         gsl_vector_short_view, c_short)
+
 # Native memory-allocation function declarations.
 native.gsl_vector_alloc.argtypes = (c_size_t,)
 native.gsl_vector_alloc.restype = gsl_vector_p
@@ -86,6 +370,27 @@ native.gsl_vector_complex_calloc.restype = gsl_vector_complex_p
 native.gsl_vector_free.argtypes = (gsl_vector_p,)
 native.gsl_vector_complex_free.argtypes = (gsl_vector_complex_p,)
 
+# Native block-sharing function declarations, and (while we're looping over
+# all the types) comparison function declarations.
+for prefix, block_p, vector_p in (
+        ('gsl_vector', gsl_block_p, gsl_vector_p),
+        ('gsl_vector_complex', gsl_block_complex_p, gsl_vector_complex_p),
+        ('gsl_vector_float', gsl_block_float_p, gsl_vector_float_p),
+        ('gsl_vector_complex_float', gsl_block_complex_float_p,
+         gsl_vector_complex_float_p),
+        ('gsl_vector_int', gsl_block_int_p, gsl_vector_int_p),
+        ('gsl_vector_long', gsl_block_long_p, gsl_vector_long_p),
+        ('gsl_vector_uchar', gsl_block_uchar_p, gsl_vector_uchar_p),
+        ('gsl_vector_short', gsl_block_short_p, gsl_vector_short_p)):
+    fn = getattr(native, prefix + '_alloc_from_block')
+    fn.argtypes = (block_p, c_size_t, c_size_t, c_size_t)
+    fn.restype = vector_p
+
+    # Native comparison function declarations.
+    fn = getattr(native, prefix + '_equal')
+    fn.argtypes = (vector_p, vector_p)
+    fn.restype = c_int
+
 # Native element-access function declarations.
 native.gsl_vector_get.argtypes = (gsl_vector_p, c_size_t)
 native.gsl_vector_get.restype = c_double
@@ -102,6 +407,172 @@ native.gsl_vector_complex_memcpy.argtypes = (gsl_vector_complex_p,
                                              gsl_vector_complex_p)
 native.gsl_vector_complex_memcpy.restype = c_int
 
+# Native view function declarations.
+native.gsl_vector_subvector.argtypes = (gsl_vector_p, c_size_t, c_size_t)
+native.gsl_vector_subvector.restype = gsl_vector_view
+native.gsl_vector_complex_subvector.argtypes = (gsl_vector_complex_p,
+                                                c_size_t, c_size_t)
+native.gsl_vector_complex_subvector.restype = gsl_vector_complex_view
+
+native.gsl_vector_subvector_with_stride.argtypes = (gsl_vector_p, c_size_t,
+                                                    c_size_t, c_size_t)
+native.gsl_vector_subvector_with_stride.restype = gsl_vector_view
+native.gsl_vector_complex_subvector_with_stride.argtypes = (
+    gsl_vector_complex_p, c_size_t, c_size_t, c_size_t)
+native.gsl_vector_complex_subvector_with_stride.restype = (
+    gsl_vector_complex_view)
+
+native.gsl_vector_complex_real.argtypes = (gsl_vector_complex_p,)
+native.gsl_vector_complex_real.restype = gsl_vector_view
+native.gsl_vector_complex_imag.argtypes = (gsl_vector_complex_p,)
+native.gsl_vector_complex_imag.restype = gsl_vector_view
+
+# View struct types, and native functions for views of part of a vector.
+_view_fns = {'d': (gsl_vector_view,
+                   native.gsl_vector_subvector,
+                   native.gsl_vector_subvector_with_stride),
+             'C': (gsl_vector_complex_view,
+                   native.gsl_vector_complex_subvector,
+                   native.gsl_vector_complex_subvector_with_stride),
+             'f': (gsl_vector_float_view,
+                   native.gsl_vector_float_subvector,
+                   native.gsl_vector_float_subvector_with_stride),
+             'F': (gsl_vector_complex_float_view,
+                   native.gsl_vector_complex_float_subvector,
+                   native.gsl_vector_complex_float_subvector_with_stride),
+             'i': (gsl_vector_int_view,
+                   native.gsl_vector_int_subvector,
+                   native.gsl_vector_int_subvector_with_stride),
+             'l': (gsl_vector_long_view,
+                   native.gsl_vector_long_subvector,
+                   native.gsl_vector_long_subvector_with_stride),
+             'B': (gsl_vector_uchar_view,
+                   native.gsl_vector_uchar_subvector,
+                   native.gsl_vector_uchar_subvector_with_stride),
+             'h': (gsl_vector_short_view,
+                   native.gsl_vector_short_subvector,
+                   native.gsl_vector_short_subvector_with_stride)}
+
+# Typecodes of the real and imaginary parts of complex vectors, and native
+# functions for views of those parts.
+_part_fns = {'C': ('d',
+                   native.gsl_vector_complex_real,
+                   native.gsl_vector_complex_imag),
+             'F': ('f',
+                   native.gsl_vector_complex_float_real,
+                   native.gsl_vector_complex_float_imag)}
+
+# Native struct types of the elements of complex vectors.
+_complex_structs = {'C': gsl_complex,
+                    'F': gsl_complex_float}
+
+def _view_of_memory(typecode, data, size):
+    """Make a native vector view of memory that GSL did not allocate.
+
+    The data argument is a ctypes object at the start of the memory.
+
+    """
+    view_type, _, _ = _view_fns[typecode]
+    view = view_type()
+    view.vector.size = size
+    view.vector.stride = 1
+    view.vector.data = cast(data, dict(view.vector._fields_)['data'])
+    return view
+
+# Memory-mapped file access modes.
+_mmap_modes = {'r': mmap.ACCESS_COPY,
+               'c': mmap.ACCESS_COPY,
+               'r+': mmap.ACCESS_WRITE}
+
+# Typecodes that vectors of each typecode can be coerced to, from the least
+# general (the typecode itself) to the most. Integers widen to larger integers,
+# all real typecodes widen to 'd' and then to 'C', and single precision widens
+# to 'F' as well.
+_coercions = {'B': ('B', 'h', 'i', 'l', 'd', 'C'),
+              'h': ('h', 'i', 'l', 'd', 'C'),
+              'i': ('i', 'l', 'd', 'C'),
+              'l': ('l', 'd', 'C'),
+              'f': ('f', 'F', 'd', 'C'),
+              'F': ('F', 'C'),
+              'd': ('d', 'C'),
+              'C': ('C',)}
+
+# Complex typecodes for combining vectors of each real typecode with complex
+# numbers.
+_complex_typecodes = {'d': 'C',
+                      'f': 'F',
+                      'i': 'C',
+                      'l': 'C',
+                      'B': 'C',
+                      'h': 'C'}
+
+def _common_typecode(*typecodes):
+    """Find the least general typecode that all the given ones coerce to."""
+    candidates = _coercions[typecodes[0]]
+    for typecode in typecodes[1:]:
+        candidates = [c for c in candidates if c in _coercions[typecode]]
+    return candidates[0]
+
+def _scalar_typecode(typecode, val):
+    """Find the typecode for combining a number with a vector's elements.
+
+    Real numbers keep the vector's typecode, and complex numbers need a
+    complex typecode of the same precision. Integer vectors keep their
+    typecode only for integers, and need 'd' for other real numbers.
+
+    """
+    if isinstance(val, Integral) or typecode in _part_fns:
+        return typecode
+    elif isinstance(val, Real):
+        return 'd' if typecode in _integer_typecodes else typecode
+    else:
+        return _complex_typecodes[typecode]
+
+def _reciprocal(x):
+    """Find the reciprocal of a number."""
+    return 1 / x
+
+def _free_vector(item):
+    """Finalizer for vectors that own their memory.
+
+    The item is a tuple of the vector's typecode, the native vector
+    pointer, the native function to free it with, and the account that
+    it is charged to. If pooling is enabled, the vector is kept for
+    reuse instead of being freed.
+
+    """
+    typecode, vector_p, free_fn, account = item
+    capacity = vector_p.contents.block.contents.size
+    nbytes = capacity * _itemsizes[typecode]
+    memory.uncharge(account, nbytes)
+    pool.release(typecode, capacity, vector_p, free_fn, nbytes)
+
+def _free_block_vector(item):
+    """Finalizer for vectors made from a Block.
+
+    The item is a tuple of the native vector pointer, the native
+    function to free it with, and the block. Only the vector struct is
+    freed, since the vector doesn't own the block's memory; holding the
+    block keeps it alive until then.
+
+    """
+    vector_p, free_fn, _ = item
+    free_fn(vector_p)
+
+def _in_use(obj):
+    """Test whether an object that uses a vector's memory is in use."""
+    return obj is not None and not (isinstance(obj, Vector) and obj.closed)
+
+def _release_base(base):
+    """Finalizer for vector views.
+
+    Nothing needs to be freed, but the finalization record holds a
+    reference to the object that owns a view's memory, and so keeps
+    that object alive until the view itself is collected.
+
+    """
+    pass
+
 # Native vector-operation function declarations.
 native.gsl_vector_add.argtypes = (gsl_vector_p, gsl_vector_p)
 native.gsl_vector_add.restype = c_int
@@ -109,20 +580,286 @@ native.gsl_vector_complex_add.argtypes = (gsl_vector_complex_p,
                                           gsl_vector_complex_p)
 native.gsl_vector_complex_add.restype = c_int
 
+for fn_name in ('sub', 'mul', 'div'):
+    fn = getattr(native, 'gsl_vector_' + fn_name)
+    fn.argtypes = (gsl_vector_p, gsl_vector_p)
+    fn.restype = c_int
+
+    fn = getattr(native, 'gsl_vector_complex_' + fn_name)
+    fn.argtypes = (gsl_vector_complex_p, gsl_vector_complex_p)
+    fn.restype = c_int
+
+native.gsl_vector_scale.argtypes = (gsl_vector_p, c_double)
+native.gsl_vector_scale.restype = c_int
+native.gsl_vector_complex_scale.argtypes = (gsl_vector_complex_p,
+                                            gsl_complex)
+native.gsl_vector_complex_scale.restype = c_int
+
+native.gsl_vector_add_constant.argtypes = (gsl_vector_p, c_double)
+native.gsl_vector_add_constant.restype = c_int
+native.gsl_vector_complex_add_constant.argtypes = (gsl_vector_complex_p,
+                                                   gsl_complex)
+native.gsl_vector_complex_add_constant.restype = c_int
+
+native.gsl_vector_set_zero.argtypes = (gsl_vector_p,)
+native.gsl_vector_set_zero.restype = None
+native.gsl_vector_complex_set_zero.argtypes = (gsl_vector_complex_p,)
+native.gsl_vector_complex_set_zero.restype = None
+native.gsl_vector_complex_float_set_zero.argtypes = (
+    gsl_vector_complex_float_p,)
+native.gsl_vector_complex_float_set_zero.restype = None
+
+# Native functions to set every element of vectors to zero.
+_set_zero_fns = {'d': native.gsl_vector_set_zero,
+                 'C': native.gsl_vector_complex_set_zero,
+                 'f': native.gsl_vector_float_set_zero,
+                 'F': native.gsl_vector_complex_float_set_zero,
+                 'i': native.gsl_vector_int_set_zero,
+                 'l': native.gsl_vector_long_set_zero,
+                 'B': native.gsl_vector_uchar_set_zero,
+                 'h': native.gsl_vector_short_set_zero}
+
 native.gsl_blas_ddot.argtypes = (gsl_vector_p, gsl_vector_p, c_double_p)
 native.gsl_blas_ddot.restype = c_int
 native.gsl_blas_zdotu.argtypes = (gsl_vector_complex_p, gsl_vector_complex_p,
                                   gsl_complex_p)
 native.gsl_blas_zdotu.restype = c_int
 
+native.gsl_blas_sdot.argtypes = (gsl_vector_float_p, gsl_vector_float_p,
+                                 c_float_p)
+native.gsl_blas_sdot.restype = c_int
+
 native.gsl_blas_dnrm2.argtypes = (gsl_vector_p,)
 native.gsl_blas_dnrm2.restype = c_double
 native.gsl_blas_dznrm2.argtypes = (gsl_vector_complex_p,)
 native.gsl_blas_dznrm2.restype = c_double
+native.gsl_blas_snrm2.argtypes = (gsl_vector_float_p,)
+native.gsl_blas_snrm2.restype = c_float
+
+native.gsl_blas_daxpy.argtypes = (c_double, gsl_vector_p, gsl_vector_p)
+native.gsl_blas_daxpy.restype = c_int
+native.gsl_blas_zaxpy.argtypes = (gsl_complex, gsl_vector_complex_p,
+                                  gsl_vector_complex_p)
+native.gsl_blas_zaxpy.restype = c_int
+
+native.gsl_blas_dscal.argtypes = (c_double, gsl_vector_p)
+native.gsl_blas_dscal.restype = None
+native.gsl_blas_zscal.argtypes = (gsl_complex, gsl_vector_complex_p)
+native.gsl_blas_zscal.restype = None
+native.gsl_blas_zdscal.argtypes = (c_double, gsl_vector_complex_p)
+native.gsl_blas_zdscal.restype = None
+
+native.gsl_blas_dasum.argtypes = (gsl_vector_p,)
+native.gsl_blas_dasum.restype = c_double
+native.gsl_blas_dzasum.argtypes = (gsl_vector_complex_p,)
+native.gsl_blas_dzasum.restype = c_double
+
+native.gsl_blas_idamax.argtypes = (gsl_vector_p,)
+native.gsl_blas_idamax.restype = c_size_t
+native.gsl_blas_izamax.argtypes = (gsl_vector_complex_p,)
+native.gsl_blas_izamax.restype = c_size_t
+
+native.gsl_blas_dswap.argtypes = (gsl_vector_p, gsl_vector_p)
+native.gsl_blas_dswap.restype = c_int
+native.gsl_blas_zswap.argtypes = (gsl_vector_complex_p, gsl_vector_complex_p)
+native.gsl_blas_zswap.restype = c_int
+
+native.gsl_blas_saxpy.argtypes = (c_float, gsl_vector_float_p,
+                                  gsl_vector_float_p)
+native.gsl_blas_saxpy.restype = c_int
+native.gsl_blas_sscal.argtypes = (c_float, gsl_vector_float_p)
+native.gsl_blas_sscal.restype = None
+native.gsl_blas_sasum.argtypes = (gsl_vector_float_p,)
+native.gsl_blas_sasum.restype = c_float
+native.gsl_blas_isamax.argtypes = (gsl_vector_float_p,)
+native.gsl_blas_isamax.restype = c_size_t
+native.gsl_blas_sswap.argtypes = (gsl_vector_float_p, gsl_vector_float_p)
+native.gsl_blas_sswap.restype = c_int
+native.gsl_blas_scopy.argtypes = (gsl_vector_float_p, gsl_vector_float_p)
+native.gsl_blas_scopy.restype = c_int
+
+native.gsl_blas_cdotu.argtypes = (gsl_vector_complex_float_p,
+                                  gsl_vector_complex_float_p,
+                                  gsl_complex_float_p)
+native.gsl_blas_cdotu.restype = c_int
+native.gsl_blas_scnrm2.argtypes = (gsl_vector_complex_float_p,)
+native.gsl_blas_scnrm2.restype = c_float
+native.gsl_blas_caxpy.argtypes = (gsl_complex_float,
+                                  gsl_vector_complex_float_p,
+                                  gsl_vector_complex_float_p)
+native.gsl_blas_caxpy.restype = c_int
+native.gsl_blas_cscal.argtypes = (gsl_complex_float,
+                                  gsl_vector_complex_float_p)
+native.gsl_blas_cscal.restype = None
+native.gsl_blas_csscal.argtypes = (c_float, gsl_vector_complex_float_p)
+native.gsl_blas_csscal.restype = None
+native.gsl_blas_scasum.argtypes = (gsl_vector_complex_float_p,)
+native.gsl_blas_scasum.restype = c_float
+native.gsl_blas_icamax.argtypes = (gsl_vector_complex_float_p,)
+native.gsl_blas_icamax.restype = c_size_t
+native.gsl_blas_cswap.argtypes = (gsl_vector_complex_float_p,
+                                  gsl_vector_complex_float_p)
+native.gsl_blas_cswap.restype = c_int
+native.gsl_blas_ccopy.argtypes = (gsl_vector_complex_float_p,
+                                  gsl_vector_complex_float_p)
+native.gsl_blas_ccopy.restype = c_int
+
+native.gsl_blas_dcopy.argtypes = (gsl_vector_p, gsl_vector_p)
+native.gsl_blas_dcopy.restype = c_int
+native.gsl_blas_zcopy.argtypes = (gsl_vector_complex_p, gsl_vector_complex_p)
+native.gsl_blas_zcopy.restype = c_int
+
+# Native BLAS level 1 functions for each typecode: axpy, scal (by a scalar of
+# the same type), scal (by a real scalar), asum, iamax, swap and copy.
+_blas_fns = {'d': (native.gsl_blas_daxpy,
+                   native.gsl_blas_dscal,
+                   native.gsl_blas_dscal,
+                   native.gsl_blas_dasum,
+                   native.gsl_blas_idamax,
+                   native.gsl_blas_dswap,
+                   native.gsl_blas_dcopy),
+             'C': (native.gsl_blas_zaxpy,
+                   native.gsl_blas_zscal,
+                   native.gsl_blas_zdscal,
+                   native.gsl_blas_dzasum,
+                   native.gsl_blas_izamax,
+                   native.gsl_blas_zswap,
+                   native.gsl_blas_zcopy),
+             'f': (native.gsl_blas_saxpy,
+                   native.gsl_blas_sscal,
+                   native.gsl_blas_sscal,
+                   native.gsl_blas_sasum,
+                   native.gsl_blas_isamax,
+                   native.gsl_blas_sswap,
+                   native.gsl_blas_scopy),
+             'F': (native.gsl_blas_caxpy,
+                   native.gsl_blas_cscal,
+                   native.gsl_blas_csscal,
+                   native.gsl_blas_scasum,
+                   native.gsl_blas_icamax,
+                   native.gsl_blas_cswap,
+                   native.gsl_blas_ccopy)}
+
+# Native reduction function declarations.
+native.gsl_vector_sum.argtypes = (gsl_vector_p,)
+native.gsl_vector_sum.restype = c_double
+
+native.gsl_vector_max.argtypes = (gsl_vector_p,)
+native.gsl_vector_max.restype = c_double
+native.gsl_vector_min.argtypes = (gsl_vector_p,)
+native.gsl_vector_min.restype = c_double
+native.gsl_vector_minmax.argtypes = (gsl_vector_p, c_double_p, c_double_p)
+native.gsl_vector_minmax.restype = None
+
+native.gsl_vector_max_index.argtypes = (gsl_vector_p,)
+native.gsl_vector_max_index.restype = c_size_t
+native.gsl_vector_min_index.argtypes = (gsl_vector_p,)
+native.gsl_vector_min_index.restype = c_size_t
+
+native.gsl_vector_isnull.argtypes = (gsl_vector_p,)
+native.gsl_vector_isnull.restype = c_int
+native.gsl_vector_complex_isnull.argtypes = (gsl_vector_complex_p,)
+native.gsl_vector_complex_isnull.restype = c_int
+
+native.gsl_vector_ispos.argtypes = (gsl_vector_p,)
+native.gsl_vector_ispos.restype = c_int
+native.gsl_vector_complex_ispos.argtypes = (gsl_vector_complex_p,)
+native.gsl_vector_complex_ispos.restype = c_int
+
+# Native summation functions, for each typecode that has one. (Complex vectors
+# are summed by their real and imaginary parts. The native sums of unsigned
+# char and short vectors have the same type as their elements, and so would
+# overflow all too easily; those are summed in Python.)
+_sum_fns = {'d': native.gsl_vector_sum,
+            'f': native.gsl_vector_float_sum,
+            'i': native.gsl_vector_int_sum,
+            'l': native.gsl_vector_long_sum}
+
+# Native functions for typecodes whose values are ordered: min, max, minmax,
+# min_index and max_index.
+_ordered_fns = {'d': (native.gsl_vector_min,
+                      native.gsl_vector_max,
+                      native.gsl_vector_minmax,
+                      native.gsl_vector_min_index,
+                      native.gsl_vector_max_index),
+                'f': (native.gsl_vector_float_min,
+                      native.gsl_vector_float_max,
+                      native.gsl_vector_float_minmax,
+                      native.gsl_vector_float_min_index,
+                      native.gsl_vector_float_max_index)}
+for typecode, prefix in (('i', 'gsl_vector_int'),
+                         ('l', 'gsl_vector_long'),
+                         ('B', 'gsl_vector_uchar'),
+                         ('h', 'gsl_vector_short')):
+    _ordered_fns[typecode] = tuple(getattr(native, prefix + '_' + name)
+                                   for name in ('min', 'max', 'minmax',
+                                                'min_index', 'max_index'))
+
+# Native functions to test the elements of vectors: isnull and ispos.
+_test_fns = {'d': (native.gsl_vector_isnull,
+                   native.gsl_vector_ispos),
+             'C': (native.gsl_vector_complex_isnull,
+                   native.gsl_vector_complex_ispos),
+             'f': (native.gsl_vector_float_isnull,
+                   native.gsl_vector_float_ispos),
+             'F': (native.gsl_vector_complex_float_isnull,
+                   native.gsl_vector_complex_float_ispos),
+             'i': (native.gsl_vector_int_isnull,
+                   native.gsl_vector_int_ispos),
+             'l': (native.gsl_vector_long_isnull,
+                   native.gsl_vector_long_ispos),
+             'B': (native.gsl_vector_uchar_isnull,
+                   native.gsl_vector_uchar_ispos),
+             'h': (native.gsl_vector_short_isnull,
+                   native.gsl_vector_short_ispos)}
+
+# The native functions that every typecode has, as used by Vector objects.
+_NativeFns = namedtuple('_NativeFns', ('alloc', 'calloc', 'alloc_from_block',
+                                       'free', 'get', 'set', 'copy', 'equal',
+                                       'add', 'sub', 'mul', 'div', 'scale',
+                                       'add_constant', 'dot', 'norm'))
+
+def _vector_fns(prefix, dot_fn=None, norm_fn=None):
+    """Collect the native functions for a type of vector.
+
+    Arguments:
+        prefix -- the common prefix of the native function names, such
+            as 'gsl_vector_float'.
+        dot_fn, norm_fn -- the native BLAS functions for the dot
+            product and the Euclidean norm, if there are any.
+
+    """
+    return _NativeFns(*[getattr(native, prefix + '_' + name)
+                        for name in ('alloc', 'calloc', 'alloc_from_block',
+                                     'free', 'get', 'set', 'memcpy', 'equal',
+                                     'add', 'sub', 'mul', 'div', 'scale',
+                                     'add_constant')],
+                      dot=dot_fn, norm=norm_fn)
 
 # Pythonic class wrapping vector functionality.
 class Vector(Sequence):
     """A vector, or one-dimensional matrix of scalar values."""
+    __slots__ = ('_v_p', '_size', '_typecode', '_fns', '_finalizer',
+                 '_exports', '__weakref__')
+
+    # Native functions for each typecode. There are no BLAS functions for
+    # integer vectors, so they have no dot product or norm functions of their
+    # own.
+    _native_fns = {'d': _vector_fns('gsl_vector', native.gsl_blas_ddot,
+                                    native.gsl_blas_dnrm2),
+                   'C': _vector_fns('gsl_vector_complex',
+                                    native.gsl_blas_zdotu,
+                                    native.gsl_blas_dznrm2),
+                   'f': _vector_fns('gsl_vector_float', native.gsl_blas_sdot,
+                                    native.gsl_blas_snrm2),
+                   'F': _vector_fns('gsl_vector_complex_float',
+                                    native.gsl_blas_cdotu,
+                                    native.gsl_blas_scnrm2),
+                   'i': _vector_fns('gsl_vector_int'),
+                   'l': _vector_fns('gsl_vector_long'),
+                   'B': _vector_fns('gsl_vector_uchar'),
+                   'h': _vector_fns('gsl_vector_short')}
+
     def __init__(self, *args, typecode=None):
         """Construct a new vector.
 
@@ -132,15 +869,26 @@ class Vector(Sequence):
             length and elements. Otherwise, it must be a positive
             integer giving the length of the new vector.
 
+            One-dimensional objects supporting the buffer protocol,
+            with a format matching the typecode (such as array.array('d')
+            objects), are copied into the new vector in bulk. If the
+            typecode is omitted, it is inferred from the format, so
+            bytes objects give unsigned char ('B') vectors. Buffers of
+            other formats or shapes, or that don't match the typecode,
+            are copied element by element.
+
         Keyword arguments:
             typecode -- 'd' for a vector of real numbers (actually
                 double-precision floating point), or 'C' for a vector of
                 complex numbers (using double-precision floating point
-                for the real and imaginary parts). If omitted, and the
-                positional argument is an iterable, the typecode is 'd'
-                if all elements of the iterable are real, and 'C'
-                otherwise. If the typecode is omitted and the positional
-                argument is a size, the default typecode is 'd'.
+                for the real and imaginary parts). Other typecodes are
+                'f' and 'F' (real and complex single-precision floating
+                point), 'i' (int), 'l' (long), 'B' (unsigned char) and
+                'h' (short). If omitted, and the positional argument is
+                an iterable, the typecode is 'd' if all elements of the
+                iterable are real, and 'C' otherwise. If the typecode is
+                omitted and the positional argument is a size, the
+                default typecode is 'd'.
 
         """
         if len(args) != 1:
@@ -149,12 +897,24 @@ class Vector(Sequence):
 
         # Determine what the positional argument is meant to be for.
         size_or_iterable = args[0]
-        if isinstance(size_or_iterable, Iterable):
-            init_vals = list(size_or_iterable)
-            size = len(init_vals)
-        else:
-            init_vals = None
+        if isinstance(size_or_iterable, int):
+            # Check for the most common case first, since it's the cheapest.
+            init_buffer = init_vals = None
             size = size_or_iterable
+        else:
+            init_buffer = _buffer_for_init(size_or_iterable, typecode)
+            if init_buffer is not None:
+                # The data can be copied straight into the vector in bulk.
+                typecode, init_buffer = init_buffer
+                scalar_type, parts = _element_layouts[typecode]
+                size = init_buffer.nbytes // (sizeof(scalar_type) * parts)
+                init_vals = None
+            elif isinstance(size_or_iterable, Iterable):
+                init_vals = list(size_or_iterable)
+                size = len(init_vals)
+            else:
+                init_vals = None
+                size = size_or_iterable
 
         # Determine the appropriate typecode, if not provided.
         if typecode is None:
@@ -166,72 +926,298 @@ class Vector(Sequence):
                 typecode = ('d' if all(isinstance(x, Real) for x in init_vals)
                             else 'C')
 
-        # Use the typecode argument to pick the appropriate native functions.
-        native_fns = {'d': (native.gsl_vector_alloc,
-                            native.gsl_vector_calloc,
-                            native.gsl_vector_free,
-                            native.gsl_vector_get,
-                            native.gsl_vector_set,
-                            native.gsl_vector_memcpy,
-                            native.gsl_vector_add,
-                            native.gsl_blas_ddot,
-                            native.gsl_blas_dnrm2),
-                      'C': (native.gsl_vector_complex_alloc,
-                            native.gsl_vector_complex_calloc,
-                            native.gsl_vector_complex_free,
-                            native.gsl_vector_complex_get,
-                            native.gsl_vector_complex_set,
-                            native.gsl_vector_complex_memcpy,
-                            native.gsl_vector_complex_add,
-                            native.gsl_blas_zdotu,
-                            native.gsl_blas_dznrm2)
-                           }.get(typecode)
-        if (native_fns is None):
+        self._set_typecode(typecode)
+
+        # Don't bother initialising the block if we're just going to
+        # overwrite it in a moment anyway. Track it at once, so that it's
+        # still freed if that fails.
+        self._track(self._alloc(size, init=(init_buffer is None and
+                                            init_vals is None)))
+
+        if init_buffer is not None:
+            # Copy all of the data in one go.
+            if size:
+                memmove(self._v_p.contents.data, _buffer_source(init_buffer),
+                        init_buffer.nbytes)
+        elif init_vals is not None:
+            for i in range(size):
+                self[i] = init_vals[i]
+
+    @classmethod
+    def empty(cls, size, typecode='d'):
+        """Construct a new vector without initialising its elements.
+
+        This is faster than constructing a vector of zeroes, for when
+        every element is about to be overwritten anyway. The elements
+        have arbitrary values until then.
+
+        """
+        self = cls.__new__(cls)
+        self._set_typecode(typecode)
+        account = self._alloc(size, init=False)
+        self._track(account)
+        return self
+
+    def _track(self, account):
+        """Arrange for this vector's memory to be freed when it's collected."""
+        self._finalizer = finalize.track_for_finalization(
+            self, (self._typecode, self._v_p, self._fns.free, account),
+            _free_vector)
+
+    @classmethod
+    def _from_view(cls, view, typecode, base):
+        """Wrap a native vector view in a new Vector object.
+
+        The view shares memory that belongs to base, which is kept alive
+        for as long as the new Vector object is.
+
+        """
+        self = cls.__new__(cls)
+        self._set_typecode(typecode)
+        # The pointer keeps the view struct alive, which is all that needs
+        # freeing when we're done; the memory is left for base to free.
+        self._v_p = pointer(view.vector)
+        self._size = view.vector.size
+        self._exports = None
+
+        self._finalizer = finalize.track_for_finalization(self, base,
+                                                          _release_base)
+        if isinstance(base, Vector):
+            base._add_export(self)
+        return self
+
+    @classmethod
+    def from_block(cls, block, offset=0, n=None, stride=1):
+        """Create a vector that uses the memory of a Block.
+
+        Any number of vectors can share one block, for instance to treat
+        the channels of interleaved data as separate vectors without
+        copying them. The block is kept alive for as long as any vector
+        made from it is.
+
+        Arguments:
+            block -- the gsl.block.Block object. The vector has the same
+                typecode as the block.
+            offset -- the index in the block of the vector's first
+                element. The default is 0.
+            n -- the number of elements in the vector. If omitted, the
+                vector takes as many elements as fit in the block.
+            stride -- the step between the vector's elements in the
+                block. The default is 1.
+
+        """
+        if not isinstance(block, Block):
+            raise TypeError('expected a Block, not '
+                            '{}'.format(type(block).__name__))
+        block_size = len(block)
+        if stride < 1:
+            raise ValueError('stride must be positive')
+        if offset < 0 or offset > block_size:
+            raise ValueError('offset is outside the block')
+        if n is None:
+            n = (block_size - offset + stride - 1) // stride
+        elif n < 1 or offset + (n - 1) * stride >= block_size:
+            raise ValueError('vector exceeds the size of the block')
+        if n < 1:
+            raise ValueError('no room in the block for the vector')
+
+        self = cls.__new__(cls)
+        self._set_typecode(block.typecode)
+        vector_p = self._fns.alloc_from_block(block._block_p, offset, n,
+                                              stride)
+        if not vector_p:
+            raise exception_from_result(NO_MEMORY)
+        self._v_p = vector_p
+        self._size = n
+        self._exports = None
+
+        self._finalizer = finalize.track_for_finalization(
+            self, (vector_p, self._fns.free, block), _free_block_vector)
+        block._add_export(self)
+        return self
+
+    @classmethod
+    def from_file(cls, path, mode='r', typecode='d', offset=0, length=None):
+        """Create a vector backed by a memory-mapped binary file.
+
+        The file holds the raw data of the vector's elements, in native
+        byte order. None of it is copied into memory up front.
+
+        Arguments:
+            path -- the path to the file.
+            mode -- 'r+' to write changes to the vector back to the
+                file, or 'r' or 'c' to keep changes in memory only
+                (copy-on-write). The default is 'r'.
+            typecode -- the typecode of the vector (see __init__()).
+            offset -- the position in the file, in bytes, at which the
+                vector's data begins. The default is 0.
+            length -- the number of elements in the vector. If omitted,
+                the vector extends to the end of the file.
+
+        """
+        access = _mmap_modes.get(mode)
+        if access is None:
+            raise ValueError('unknown mode {!r}'.format(mode))
+        if typecode not in _element_layouts:
             raise ValueError('unknown type code {!r}'.format(typecode))
+        scalar_type, parts = _element_layouts[typecode]
+        itemsize = sizeof(scalar_type) * parts
+
+        with open(path, 'r+b' if access == mmap.ACCESS_WRITE else 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            if length is None:
+                length = max(file_size - offset, 0) // itemsize
+            nbytes = length * itemsize
+            if offset < 0 or length < 0 or offset + nbytes > file_size:
+                raise ValueError('vector exceeds the size of the file')
 
-        (self._alloc_fn, self._calloc_fn, self._free_fn, self._getter_fn,
-         self._setter_fn, self._copy_fn, self._add_fn, self._dot_fn,
-         self._norm_fn) = native_fns
+            if nbytes:
+                # The map must start at a multiple of the allocation
+                # granularity, which might be before the vector's data.
+                map_offset = offset - offset % mmap.ALLOCATIONGRANULARITY
+                mapped = mmap.mmap(f.fileno(), offset + nbytes - map_offset,
+                                   access=access, offset=map_offset)
+                data = (c_char * nbytes).from_buffer(mapped,
+                                                     offset - map_offset)
+            else:
+                # Empty files, and empty ranges, cannot be mapped.
+                data = None
+
+        view = _view_of_memory(typecode, data, length)
+        # Closing the file doesn't affect the map, which stays open for as long
+        # as the ctypes object referring to it is alive.
+        return cls._from_view(view, typecode, data)
+
+    def _set_typecode(self, typecode):
+        """Pick the native functions to use for the given typecode."""
+        native_fns = self._native_fns.get(typecode)
+        if native_fns is None:
+            raise ValueError('unknown type code {!r}'.format(typecode))
+        self._fns = native_fns
 
         # Remember the typecode for later, so we know whether we need to call
         # other functions before or after native calls (which is needed when
         # it's a complex type, to convert Python complex to/from gsl_complex).
         self._typecode = typecode
 
-        if init_vals is not None:
-            # Don't bother initialising the block, because we're just going to
-            # overwrite it in a moment anyway.
-            self._alloc(size, init=False)
-
-            for i in range(size):
-                self[i] = init_vals[i]
-        else:
-            # Initialise the block to all zeroes.
-            self._alloc(size, init=True)
-
-        finalize.track_for_finalization(self, self._v_p, self._free_fn)
-
     @property
     def _as_parameter_(self):
         return self._v_p
 
+    def __buffer__(self, flags):
+        """Export this vector's data using the buffer protocol."""
+        # Python 3.12+ (PEP 688) calls this for memoryview(), and so on.
+        return self.buffer()
+
+    @property
+    def __array_interface__(self):
+        """Describe this vector's data for NumPy, without copying it.
+
+        The data is given as a ctypes object, rather than a bare
+        address, so that the vector can't be closed while an array made
+        from it (which keeps that object alive) is in use.
+
+        """
+        scalar_type, parts = _element_layouts[self._typecode]
+        v = self._v_p.contents
+        data, _ = self._export_data()
+        return {'version': 3,
+                'shape': (v.size,),
+                'typestr': _array_typestrs[self._typecode],
+                'data': data,
+                'strides': (v.stride * parts * sizeof(scalar_type),)}
+
     def _as_typecode(self, typecode):
         """Return a copy of this vector with a more general typecode.
 
-        Vectors of real values can always be coerced to complex vectors
-        with the same data type.
+        Vectors of real values can always be coerced to complex vectors,
+        single-precision and integer vectors to double precision, and
+        integer vectors to larger integer types. If the given typecode
+        is not more general, this vector is returned as it is.
 
         """
-        # Coercion rules: d coerces to C.
-        if typecode == 'C' and self._typecode == 'd':
-            coerced = Vector(len(self), typecode=typecode)
-            for i, val in enumerate(self):
-                coerced[i] = val
+        # Coercion rules: see _coercions.
+        if (typecode != self._typecode and
+            _common_typecode(self._typecode, typecode) == typecode):
+            coerced = Vector.empty(len(self), typecode=typecode)
+            self._copy_to(coerced)
             return coerced
         else:
             return self
 
+    def _copy_to(self, dest):
+        """Copy this vector's elements into another vector.
+
+        The other vector must be the same length. If it has a different
+        typecode, the elements are converted to that typecode, but
+        complex elements cannot be copied into a real vector.
+
+        """
+        if dest._typecode == self._typecode:
+            errcode = dest._fns.copy(dest._v_p, self._v_p)
+            if errcode:
+                raise exception_from_result(errcode)
+        elif dest._typecode in _part_fns:
+            if self._typecode in _part_fns:
+                self.real._copy_to(dest.real)
+                self.imag._copy_to(dest.imag)
+            else:
+                # Zero the imaginary parts, and copy the real parts into
+                # place.
+                imag_part = dest.imag
+                _set_zero_fns[imag_part._typecode](imag_part)
+                self._copy_to(dest.real)
+        elif self._typecode in _part_fns:
+            raise TypeError('cannot copy complex elements into a real vector')
+        elif len(dest) != len(self):
+            raise TypeError('vectors must have the same length')
+        else:
+            # There are no native functions for converting between real
+            # types, so do it in bulk through an array.
+            scalar_type, _ = _element_layouts[dest._typecode]
+            values = self.buffer()
+            if (dest._typecode in _integer_typecodes and
+                self._typecode not in _integer_typecodes):
+                # Truncate floating-point values towards zero.
+                values = map(int, values)
+            dest.buffer()[:] = array(scalar_type._type_, values)
+
+    def astype(self, typecode):
+        """Return a copy of this vector with the given typecode.
+
+        Converting a complex vector to a real one discards the imaginary
+        parts of its elements, and converting a floating-point vector to
+        an integer one truncates its elements towards zero. Elements
+        that are out of range for an integer typecode raise an
+        OverflowError.
+
+        """
+        if typecode not in _element_layouts:
+            raise ValueError('unknown type code {!r}'.format(typecode))
+
+        if typecode == self._typecode:
+            return self.__copy__()
+        elif typecode not in _part_fns and self._typecode in _part_fns:
+            return self.real.astype(typecode)
+
+        converted = Vector.empty(len(self), typecode=typecode)
+        self._copy_to(converted)
+        return converted
+
+    def __reduce_ex__(self, protocol):
+        """Support pickling, with out-of-band data for protocol 5+."""
+        if protocol >= 5:
+            view = self.buffer()
+            data = PickleBuffer(view if view.c_contiguous else
+                                view.tobytes())
+        else:
+            data = self.tobytes()
+        return (_vector_from_data, (data, self._typecode))
+
     def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._subvector(index)
+
         # FIXME: Bounds checking is not working, so I've done my own.
         # How is GSL supposed to report an out-of-bounds error to me?
         # (Crash-on-error is turned off, and turning it on still won't report
@@ -239,24 +1225,246 @@ class Vector(Sequence):
         # the default __iter__ implementation for a Sequence never terminates.
         if not (0 <= index < len(self)):
             raise IndexError('index out of range')
-        val = self._getter_fn(self._v_p, index)
+        val = self._fns.get(self._v_p, index)
+
+        return complex(val) if self._typecode in _complex_structs else val
+
+    def _subvector(self, index):
+        """Get a view of part of this vector, given by a slice object."""
+        start, stop, step = index.indices(len(self))
+        if step < 0:
+            # GSL strides are unsigned.
+            raise ValueError('slice step must be positive')
+        size = len(range(start, stop, step))
 
-        return complex(val) if self._typecode == 'C' else val
+        view_type, subvector_fn, strided_subvector_fn = _view_fns[
+            self._typecode]
+        if not size:
+            # GSL won't create an empty view, so make one here.
+            view = view_type()
+        elif step == 1:
+            view = subvector_fn(self._v_p, start, size)
+        else:
+            view = strided_subvector_fn(self._v_p, start, step, size)
+
+        return self._from_view(view, self._typecode, self)
+
+    @property
+    def real(self):
+        """The real parts of this vector's elements.
+
+        For a complex vector, this is a real vector that is a view of
+        the original, sharing its memory. For a real vector, it is the
+        vector itself.
+
+        """
+        part_fns = _part_fns.get(self._typecode)
+        if part_fns is None:
+            return self
+
+        part_typecode, real_fn, _ = part_fns
+        return self._from_view(real_fn(self._v_p), part_typecode, self)
+
+    @property
+    def imag(self):
+        """The imaginary parts of this vector's elements.
+
+        For a complex vector, this is a real vector that is a view of
+        the original, sharing its memory. For a real vector, it is a new
+        vector of zeroes.
+
+        """
+        part_fns = _part_fns.get(self._typecode)
+        if part_fns is None:
+            return self.__class__(len(self), typecode=self._typecode)
+
+        part_typecode, _, imag_fn = part_fns
+        return self._from_view(imag_fn(self._v_p), part_typecode, self)
+
+    def __iter__(self):
+        """Iterate over the elements of this vector."""
+        if _element_layouts[self._typecode][1] > 1:
+            # Complex values have to be assembled from their parts first.
+            return iter(self.tolist())
+        else:
+            return iter(self.buffer())
 
     def __setitem__(self, index, val):
-        if self._typecode == 'C':
-            val = gsl_complex.from_complex(val)
-        self._setter_fn(self._v_p, index, val)
+        complex_struct = _complex_structs.get(self._typecode)
+        if complex_struct is not None:
+            val = complex_struct.from_complex(val)
+        self._fns.set(self._v_p, index, val)
 
     def __len__(self):
-        return self._v_p.contents.size
+        # The size never changes, so it's cached rather than read from the
+        # native struct every time.
+        return self._size
+
+    def __getattr__(self, name):
+        # This is only called for missing attributes, so it costs nothing
+        # until a vector is closed, and close() deletes these ones.
+        if name in ('_v_p', '_size'):
+            raise ValueError('operation on a closed vector')
+        raise AttributeError("'{}' object has no attribute "
+                             "'{}'".format(type(self).__name__, name))
+
+    def _add_export(self, obj):
+        """Record an object that uses this vector's memory.
+
+        The object is a view of this vector, or a ctypes object that a
+        buffer was made from. The vector can't be closed while any
+        such object is alive.
+
+        """
+        if self._exports is None:
+            self._exports = finalize.WeakRegistry()
+        self._exports.add(obj)
+
+    @property
+    def closed(self):
+        """Whether this vector has been closed."""
+        try:
+            self._v_p
+        except ValueError:
+            return True
+        else:
+            return False
+
+    def close(self):
+        """Free this vector's memory now, instead of when it's collected.
+
+        Afterwards, any operation on the vector raises a ValueError.
+        Closing a vector that's already closed does nothing. Vectors
+        can't be closed while views of them, or buffers of their data,
+        are still in use.
+
+        """
+        if self.closed:
+            return
+        if self._exports is not None and any(_in_use(obj)
+                                             for obj in self._exports):
+            raise BufferError('cannot close a vector while views or buffers '
+                              'of it exist')
+
+        del self._v_p, self._size
+        self._exports = None
+        finalize.finalize_now(self._finalizer)
+        self._finalizer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close this vector on leaving a with statement."""
+        self.close()
+
+    # Vectors are mutable, and compare by value, so they aren't hashable.
+    __hash__ = None
+
+    def __eq__(self, other):
+        """Test whether this vector has the same elements as another.
+
+        Vectors of different typecodes are compared after coercing them
+        to a common typecode, so Vector([1, 2], typecode='i') equals
+        Vector([1.0, 2.0]). Vectors of different lengths are unequal.
+
+        """
+        if not isinstance(other, Vector):
+            return NotImplemented
+        if len(other) != len(self):
+            return False
+        typecode = _common_typecode(self._typecode, other._typecode)
+        a, b = self._as_typecode(typecode), other._as_typecode(typecode)
+        return bool(a._fns.equal(a._v_p, b._v_p))
+
+    def allclose(self, other, rtol=1e-05, atol=1e-08):
+        """Test whether this vector's elements are all close to another's.
+
+        As in NumPy, the finite elements a (of this vector) and b (of
+        the other one) are close if abs(a - b) <= atol + rtol * abs(b).
+        Infinities are close only to infinities of the same sign, and
+        NaNs are never close to anything.
+
+        The vectors are compared in bulk: identical vectors are found
+        natively, and otherwise the answer is usually settled natively
+        by comparing, element by element, the square of abs(a - b) with
+        t = atol**2 + rtol**2 * abs(b)**2. The square of the tolerance
+        lies between t and 2 * t, so the vectors are close if no
+        squared difference exceeds t, and not close if any exceeds
+        2 * t. Integer vectors are compared in double precision. Only
+        when neither holds, or the results are not finite, are the
+        elements compared one by one, from copies of both vectors'
+        data.
+
+        Arguments:
+            other -- the vector to compare with. It must be the same
+                length as this vector.
+            rtol -- the relative tolerance. The default is 1e-05.
+            atol -- the absolute tolerance. The default is 1e-08.
+
+        """
+        if not isinstance(other, Vector):
+            raise TypeError('expected a Vector, not '
+                            '{}'.format(type(other).__name__))
+        if len(other) != len(self):
+            raise TypeError('vectors must have the same length')
+        if not len(self) or self == other:
+            return True
+
+        typecode = _common_typecode(self._typecode, other._typecode)
+        if typecode in _integer_typecodes:
+            typecode = 'd'
+        a, b = self._as_typecode(typecode), other._as_typecode(typecode)
+        # The lower bound on the squared tolerance, and the amount by which
+        # the squared differences exceed it.
+        tol_sq = b._squared_abs()
+        tol_sq *= rtol * rtol
+        tol_sq += atol * atol
+        excess = (a - b)._squared_abs()
+        excess -= tol_sq
+        high = excess.max()
+        if isfinite(high):
+            if high <= 0:
+                return True
+            # Compare with the upper bound instead.
+            excess -= tol_sq
+            high = excess.max()
+            if isfinite(high) and high > 0:
+                return False
+
+        return all(x == y if isinf(x) or isinf(y) else
+                   abs(x - y) <= atol + rtol * abs(y)
+                   for x, y in zip(self.tolist(), other.tolist()))
+
+    def _parts(self):
+        """Get this vector's real and imaginary parts, if it's complex.
+
+        Real vectors give a list of just themselves.
+
+        """
+        if self._typecode in _part_fns:
+            return [self.real, self.imag]
+        else:
+            return [self]
+
+    def _squared_abs(self):
+        """Find the squares of the absolute values of the elements.
+
+        The result is a new real vector.
+
+        """
+        parts = self._parts()
+        result = parts[0] * parts[0]
+        for part in parts[1:]:
+            result += part * part
+        return result
 
     def __copy__(self):
         """Create a shallow copy of this vector."""
-        other = self.__class__(len(self), typecode=self._typecode)
+        other = self.empty(len(self), typecode=self._typecode)
 
         # Call the copy function and check for errors.
-        errcode = self._copy_fn(other, self._v_p)
+        errcode = self._fns.copy(other, self._v_p)
         if errcode:
             raise exception_from_result(errcode)
         else:
@@ -264,79 +1472,590 @@ class Vector(Sequence):
 
     def __abs__(self):
         """Find the Euclidean norm of this vector."""
-        return self._norm_fn(self._v_p)
+        if self._fns.norm is None:
+            # Integer vectors have no native norm function.
+            return abs(self.astype('d'))
+        return self._fns.norm(self._v_p)
 
-    def __add__(self, other):
-        """Find the sum of this vector with another."""
-        result = self.__copy__()
-        # Call the native function and check for errors.
-        try:
-            errcode = result._add_fn(result, other)
-        except ArgumentError:
-            # Coerce both vectors to the more general typecode.
-            result, other = (result._as_typecode(other._typecode),
-                             other._as_typecode(result._typecode))
-            errcode = result._add_fn(result, other)
+    def _combine(self, other, vector_fn_name, scalar_fn_name,
+                 scalar_transform=None, in_place=False, out=None,
+                 true_division=False):
+        """Combine this vector elementwise with another vector or a number.
+
+        Arguments:
+            other -- the other vector, or a number.
+            vector_fn_name -- the name of the native function to call if
+                other is a vector (a field of _NativeFns).
+            scalar_fn_name -- the name of the native function to call if
+                other is a number (a field of _NativeFns).
+            scalar_transform -- a function to apply to the number before
+                passing it to the native function (optional).
+            in_place -- whether to overwrite this vector with the result,
+                if it doesn't need coercing to another typecode. The
+                default is False.
+            out -- a vector to write the result into (optional). It
+                must have the same length as this vector, and the
+                typecode of the result.
+            true_division -- whether the operation is a true division,
+                whose result is never an integer vector. The default is
+                False.
+
+        Returns:
+            The vector holding the result, or NotImplemented if other
+            is neither a vector nor a number.
+
+        """
+        if isinstance(other, Vector):
+            typecode = _common_typecode(self._typecode, other._typecode)
+        elif isinstance(other, Number):
+            if scalar_transform is not None:
+                other = scalar_transform(other)
+            typecode = _scalar_typecode(self._typecode, other)
+        else:
+            return NotImplemented
 
+        if true_division and typecode in _integer_typecodes:
+            # Dividing integers gives real numbers, as in Python. (This also
+            # avoids native integer division by zero.)
+            typecode = 'd'
+        if isinstance(other, Vector):
+            other = other._as_typecode(typecode)
+
+        if out is not None:
+            # Check the destination, and then start with a copy of this
+            # vector in it.
+            if not isinstance(out, Vector):
+                raise TypeError('out must be a Vector, not '
+                                '{}'.format(type(out).__name__))
+            if out._typecode != typecode:
+                raise TypeError('out must have typecode {!r} to hold the '
+                                'result'.format(typecode))
+            if len(out) != len(self) or (isinstance(other, Vector) and
+                                         len(other) != len(self)):
+                raise TypeError('vectors must have the same length')
+
+            if out is other and out is not self:
+                # Don't overwrite the other operand before it's used.
+                other = other.__copy__()
+            if out is not self:
+                self._copy_to(out)
+            result = out
+        elif in_place and typecode == self._typecode:
+            # Use this vector for the result.
+            result = self
+        else:
+            # Use a new vector for the result.
+            result = self.astype(typecode)
+
+        # Call the native function and check for errors.
+        if isinstance(other, Vector):
+            errcode = getattr(result._fns, vector_fn_name)(result._v_p, other)
+        else:
+            errcode = getattr(result._fns, scalar_fn_name)(
+                result._v_p, result._scalar(other))
         if errcode:
             raise exception_from_result(errcode)
         else:
             return result
 
+    def _scalar(self, val):
+        """Convert a number for passing to native functions."""
+        complex_struct = _complex_structs.get(self._typecode)
+        return (val if complex_struct is None else
+                complex_struct.from_complex(val))
+
+    def __add__(self, other):
+        """Find the sum of this vector with another, or with a number."""
+        return self._combine(other, 'add', 'add_constant')
+
     def __iadd__(self, other):
-        """Add another vector to this one, in place."""
-        # Call the native function (which overwrites this vector by default),
-        # and check for errors.
-        try:
-            errcode = self._add_fn(self._v_p, other)
-        except ArgumentError:
-            # Create a new Vector object to hold the result of the addition.
-            self = self.__copy__()
-            # Coerce both vectors to the more general typecode.
-            self, other = (self._as_typecode(other._typecode),
-                           other._as_typecode(self._typecode))
-            # Perform the addition.
-            errcode = self._add_fn(self, other)
+        """Add another vector, or a number, to this one, in place."""
+        return self._combine(other, 'add', 'add_constant',
+                             in_place=True)
 
-        if errcode:
-            raise exception_from_result(errcode)
-        else:
-            return self
+    def __radd__(self, other):
+        """Find the sum of a number with this vector."""
+        return self._combine(other, 'add', 'add_constant')
+
+    def __sub__(self, other):
+        """Find the difference between this vector and another, or a number."""
+        return self._combine(other, 'sub', 'add_constant',
+                             scalar_transform=neg)
+
+    def __isub__(self, other):
+        """Subtract another vector, or a number, from this one, in place."""
+        return self._combine(other, 'sub', 'add_constant',
+                             scalar_transform=neg, in_place=True)
+
+    def __rsub__(self, other):
+        """Find the difference between a number and this vector."""
+        if not isinstance(other, Number):
+            return NotImplemented
+        result = -self
+        result += other
+        return result
+
+    def __mul__(self, other):
+        """Find the elementwise product of this vector and another.
+
+        If the other operand is a number, scale this vector by it.
+
+        """
+        return self._combine(other, 'mul', 'scale')
+
+    def __imul__(self, other):
+        """Multiply this vector by another, or a number, in place."""
+        return self._combine(other, 'mul', 'scale', in_place=True)
+
+    def __rmul__(self, other):
+        """Scale this vector by a number."""
+        return self._combine(other, 'mul', 'scale')
+
+    def __truediv__(self, other):
+        """Find the elementwise quotient of this vector and another.
+
+        If the other operand is a number, scale this vector by its
+        reciprocal.
+
+        """
+        return self._combine(other, 'div', 'scale',
+                             scalar_transform=_reciprocal, true_division=True)
+
+    def __itruediv__(self, other):
+        """Divide this vector by another, or a number, in place."""
+        return self._combine(other, 'div', 'scale',
+                             scalar_transform=_reciprocal, in_place=True,
+                             true_division=True)
+
+    def __rtruediv__(self, other):
+        """Find the elementwise quotient of a number and this vector."""
+        if not isinstance(other, Number):
+            return NotImplemented
+        result = self.__class__(len(self), typecode=self._typecode)
+        result += other
+        result /= self
+        return result
+
+    def __neg__(self):
+        """Find the negation of this vector."""
+        return self * -1
+
+    def __pos__(self):
+        """Find a copy of this vector."""
+        return self.__copy__()
 
     def __matmul__(self, other):
         """Use the matrix multiplication operator for the dot product."""
         return self.dot(other)
 
     def _alloc(self, size, init):
-        """Allocate a new memory block for this vector."""
-        # Use calloc if we need to initialise the new block, alloc otherwise.
-        vector_p = (self._calloc_fn if init else self._alloc_fn)(size)
-        if not vector_p:
-            # Null pointer returned; insufficient memory is available.
-            # FIXME: Theoretically, this should no longer be necessary, because
-            # the error handler callback should get called (and raise a Python
-            # exception, indeed a MemoryError) when the allocation function
-            # fails. But for some reason this isn't happening, or else the unit
-            # test isn't recognising it as happening.
-            raise exception_from_result(NO_MEMORY)
+        """Allocate a new memory block for this vector.
+
+        Returns:
+            The account that the vector is charged to (see
+            gsl.memory.charge()).
+
+        """
+        typecode = self._typecode
+        itemsize = _itemsizes[typecode]
+
+        # Reuse a pooled vector, if there's one of the right size class.
+        vector_p = pool.acquire(typecode, size)
+        if vector_p is not None:
+            v = vector_p.contents
+            # Charge the current thread for all the memory that the vector
+            # has room for, not just what it uses.
+            capacity = v.block.contents.size
+            try:
+                account = memory.charge(capacity * itemsize)
+            except MemoryError:
+                pool.release(typecode, capacity, vector_p, self._fns.free,
+                             capacity * itemsize)
+                raise
+            v.size = size
+            if init:
+                memset(v.data, 0, size * itemsize)
         else:
-            self._v_p = vector_p
+            # With pooling enabled, make room for the whole size class (if
+            # the vector could ever go back in the pool).
+            capacity = pool.alloc_size(size, itemsize)
+            # Charge the current thread before allocating, so that going over
+            # budget fails early.
+            nbytes = capacity * itemsize
+            account = memory.charge(nbytes)
+            try:
+                vector_p = self._alloc_native(capacity, size, init)
+            except BaseException:
+                memory.uncharge(account, nbytes)
+                raise
+
+        self._v_p = vector_p
+        self._size = size
+        self._exports = None
+        return account
+
+    def _alloc_native(self, capacity, size, init):
+        """Allocate a new native vector, counting it in gsl.memory.
+
+        The vector has room for capacity elements, but uses only size
+        of them.
+
+        """
+        typecode = self._typecode
+        nbytes = capacity * _itemsizes[typecode]
+        memory.record_alloc(typecode, nbytes)
+        try:
+            # Use calloc if we need to initialise the new block, alloc
+            # otherwise.
+            alloc_fn = self._fns.calloc if init else self._fns.alloc
+            vector_p = alloc_fn(capacity)
+            if not vector_p:
+                # Null pointer returned; insufficient memory is available.
+                # FIXME: Theoretically, this should no longer be necessary,
+                # because the error handler callback should get called (and
+                # raise a Python exception, indeed a MemoryError) when the
+                # allocation function fails. But for some reason this isn't
+                # happening, or else the unit test isn't recognising it as
+                # happening.
+                raise exception_from_result(NO_MEMORY)
+        except BaseException:
+            memory.cancel_alloc(typecode, nbytes)
+            raise
+        if capacity != size:
+            vector_p.contents.size = size
+        return vector_p
+
+    def _export_data(self):
+        """Get a ctypes array covering this vector's data, for export.
+
+        The array keeps this vector alive, and stops it from being
+        closed, for as long as the array itself is alive.
+
+        Returns:
+            A tuple of the array and the number of elements it covers
+            (including those skipped over by the vector's stride).
+
+        """
+        scalar_type, parts = _element_layouts[self._typecode]
+        v = self._v_p.contents
+
+        if v.size:
+            # Cover all the memory from the first element to the last.
+            count = (v.size - 1) * v.stride + 1
+            data = (scalar_type * (count * parts)).from_address(
+                cast(v.data, c_void_p).value)
+        else:
+            # There might not be any memory to cover, so use a placeholder
+            # for a single element.
+            count = 1
+            data = (scalar_type * parts)()
+
+        data._owner = self
+        self._add_export(data)
+        return data, count
+
+    def buffer(self):
+        """Get a writable memoryview of this vector's data, without copying.
+
+        Real vectors give a one-dimensional view whose format is the
+        vector's typecode. Complex vectors give a view of shape (n, 2),
+        of format 'd' (or 'f' for typecode 'F'), holding the real and
+        imaginary parts of each element.
+
+        """
+        scalar_type, parts = _element_layouts[self._typecode]
+        v = self._v_p.contents
+        data, count = self._export_data()
+        view = memoryview(data).cast('B').cast(
+            scalar_type._type_, [count, parts] if parts > 1 else [count])
+        return view[::v.stride] if v.size else view[:0]
+
+    def tolist(self):
+        """Get the elements of this vector as a list."""
+        values = self.buffer().tolist()
+        if _element_layouts[self._typecode][1] > 1:
+            # Convert pairs of real and imaginary parts to complex numbers.
+            return list(starmap(complex, values))
+        else:
+            return values
+
+    def tobytes(self):
+        """Get a packed copy of this vector's data as a bytes object."""
+        return self.buffer().tobytes()
+
+    def toarray(self):
+        """Get a copy of this vector's data as an array.array object.
+
+        The array for a complex vector holds the real and imaginary
+        parts of each element, one after the other.
+
+        """
+        scalar_type, _ = _element_layouts[self._typecode]
+        return array(scalar_type._type_, self.tobytes())
+
+    def _ordered_fns(self, name):
+        """Get the native functions for ordering this vector's elements."""
+        ordered_fns = _ordered_fns.get(self._typecode)
+        if ordered_fns is None:
+            raise TypeError('elements of a vector of typecode {!r} are not '
+                            'ordered'.format(self._typecode))
+        if not len(self):
+            raise ValueError('{}() of an empty vector'.format(name))
+        return ordered_fns
+
+    def sum(self):
+        """Find the sum of this vector's elements.
+
+        As in GSL, the sum of an int or long vector has the same type as
+        its elements, and so can overflow.
+
+        """
+        sum_fn = _sum_fns.get(self._typecode)
+        if sum_fn is not None:
+            return sum_fn(self._v_p)
+        elif self._typecode in _part_fns:
+            return complex(self.real.sum(), self.imag.sum())
+        else:
+            return sum(self.buffer())
+
+    def min(self):
+        """Find the smallest of this vector's elements."""
+        return self._ordered_fns('min')[0](self._v_p)
+
+    def max(self):
+        """Find the largest of this vector's elements."""
+        return self._ordered_fns('max')[1](self._v_p)
+
+    def minmax(self):
+        """Find the smallest and largest of this vector's elements.
+
+        Returns:
+            A tuple of the smallest and the largest element.
+
+        """
+        minmax_fn = self._ordered_fns('minmax')[2]
+        scalar_type, _ = _element_layouts[self._typecode]
+        min_val, max_val = scalar_type(), scalar_type()
+        minmax_fn(self._v_p, byref(min_val), byref(max_val))
+        return min_val.value, max_val.value
+
+    def argmin(self):
+        """Find the index of the (first) smallest element of this vector."""
+        return self._ordered_fns('argmin')[3](self._v_p)
+
+    def argmax(self):
+        """Find the index of the (first) largest element of this vector."""
+        return self._ordered_fns('argmax')[4](self._v_p)
+
+    def isnull(self):
+        """Test whether all of this vector's elements are zero."""
+        return bool(_test_fns[self._typecode][0](self._v_p))
+
+    def ispos(self):
+        """Test whether all of this vector's elements are positive.
+
+        For complex vectors, both the real and imaginary parts of every
+        element must be positive.
+
+        """
+        return bool(_test_fns[self._typecode][1](self._v_p))
+
+    def _in_place_operand(self, other):
+        """Coerce an operand of an in-place operation to this typecode.
+
+        The operand is a vector or a number. If it has a more general
+        typecode than this vector, a TypeError is raised, because the
+        result cannot be stored in place.
+
+        """
+        if isinstance(other, Vector):
+            other_typecode = other._typecode
+        else:
+            other_typecode = _scalar_typecode(self._typecode, other)
+
+        if _common_typecode(self._typecode, other_typecode) != self._typecode:
+            raise TypeError('cannot store the result in a vector of typecode '
+                            '{!r}'.format(self._typecode))
+
+        if isinstance(other, Vector):
+            return other._as_typecode(self._typecode)
+        else:
+            return self._scalar(other)
+
+    def _blas_fns(self):
+        """Get the native BLAS functions for this vector's typecode."""
+        blas_fns = _blas_fns.get(self._typecode)
+        if blas_fns is None:
+            raise TypeError('there are no BLAS operations for vectors of '
+                            'typecode {!r}'.format(self._typecode))
+        return blas_fns
+
+    def axpy(self, alpha, x):
+        """Add a multiple of another vector to this one, in place.
+
+        This is the BLAS axpy operation, y = alpha * x + y, with this
+        vector as y.
+
+        """
+        axpy_fn = self._blas_fns()[0]
+        errcode = axpy_fn(self._in_place_operand(alpha),
+                          self._in_place_operand(x), self._v_p)
+        if errcode:
+            raise exception_from_result(errcode)
+
+    def scale(self, alpha):
+        """Multiply this vector by a number, in place."""
+        if self._typecode in _integer_typecodes:
+            # There's no BLAS for integers, but GSL can still scale them.
+            errcode = self._fns.scale(self._v_p,
+                                      self._in_place_operand(alpha))
+            if errcode:
+                raise exception_from_result(errcode)
+            return
+
+        _, scal_fn, real_scal_fn, _, _, _, _ = _blas_fns[self._typecode]
+        if isinstance(alpha, Real):
+            real_scal_fn(alpha, self._v_p)
+        else:
+            scal_fn(self._in_place_operand(alpha), self._v_p)
+
+    def asum(self):
+        """Find the sum of the absolute values of this vector's elements.
+
+        For complex vectors, this is the sum of the absolute values of
+        the real and imaginary parts.
+
+        """
+        return self._blas_fns()[3](self._v_p)
+
+    def iamax(self):
+        """Find the index of the element with the largest absolute value.
+
+        For complex vectors, this is the element with the largest sum of
+        the absolute values of its real and imaginary parts.
+
+        """
+        return self._blas_fns()[4](self._v_p)
+
+    def swap(self, other):
+        """Exchange the elements of this vector with those of another.
+
+        The vectors must have the same length and typecode.
+
+        """
+        if other._typecode != self._typecode:
+            raise TypeError('cannot swap vectors of typecodes {!r} and '
+                            '{!r}'.format(self._typecode, other._typecode))
+
+        errcode = self._blas_fns()[5](self._v_p, other)
+        if errcode:
+            raise exception_from_result(errcode)
+
+    def copy_from(self, other):
+        """Copy the elements of another vector into this one.
+
+        The vectors must have the same length, and the other vector
+        must have the same typecode as this one or a less general one.
+
+        """
+        if (other._typecode != self._typecode or
+            self._typecode not in _blas_fns):
+            # Check that the other vector can be coerced, and then do so while
+            # copying.
+            self._in_place_operand(other)
+            other._copy_to(self)
+            return
+
+        errcode = _blas_fns[self._typecode][6](other, self._v_p)
+        if errcode:
+            raise exception_from_result(errcode)
 
     def dot(self, other):
-        """Calculate the scalar (dot) product of two vectors."""
+        """Calculate the scalar (dot) product of two vectors.
+
+        The dot product of integer vectors is found in double precision.
+
+        """
+        typecode = _common_typecode(self._typecode, other._typecode)
+        if typecode not in _blas_fns:
+            typecode = 'd'
+        self, other = self._as_typecode(typecode), other._as_typecode(typecode)
+
         # Construct and initialise a pointer to hold the result.
-        if self._typecode != other._typecode:
-            self, other = (self._as_typecode(other._typecode),
-                           other._as_typecode(self._typecode))
 
-        result = pointer(gsl_complex.from_complex(0+0j)
-                         if self._typecode == 'C' else
-                         c_double(0.0))
+        result_type = _complex_structs.get(self._typecode)
+        if result_type is None:
+            result_type, _ = _element_layouts[self._typecode]
+        result = pointer(result_type())
 
         # Call the function and check for errors.
-        errcode = self._dot_fn(self._v_p, other, result)
+        errcode = self._fns.dot(self._v_p, other, result)
         if errcode:
             raise exception_from_result(errcode)
         else:
-            return (complex(result.contents) if self._typecode == 'C' else
+            return (complex(result.contents)
+                    if self._typecode in _complex_structs else
                     result.contents.value)
+
+
+def _vector_from_data(data, typecode):
+    """Rebuild a pickled vector from its raw data."""
+    view = memoryview(data).cast('B')
+    v = Vector.empty(view.nbytes // _itemsizes[typecode], typecode=typecode)
+    if view.nbytes:
+        memmove(v._v_p.contents.data, _buffer_source(view), view.nbytes)
+    return v
+
+
+def _apply(a, b, out, vector_fn_name, scalar_fn_name, scalar_transform=None,
+           true_division=False):
+    """Combine a vector elementwise with another vector or a number."""
+    if not isinstance(a, Vector):
+        raise TypeError('first operand must be a Vector, not '
+                        '{}'.format(type(a).__name__))
+
+    result = a._combine(b, vector_fn_name, scalar_fn_name,
+                        scalar_transform=scalar_transform, out=out,
+                        true_division=true_division)
+    if result is NotImplemented:
+        raise TypeError('second operand must be a Vector or a number, not '
+                        '{}'.format(type(b).__name__))
+    return result
+
+def add(a, b, out=None):
+    """Find the sum of a vector and another vector, or a number.
+
+    If out is given, the result is written into it (and returned)
+    instead of into a new vector. It must be a vector of the same
+    length, with the typecode of the result.
+
+    """
+    return _apply(a, b, out, 'add', 'add_constant')
+
+def sub(a, b, out=None):
+    """Find the difference between a vector and another vector, or a number.
+
+    The out argument is as for add().
+
+    """
+    return _apply(a, b, out, 'sub', 'add_constant',
+                  scalar_transform=neg)
+
+def mul(a, b, out=None):
+    """Find the elementwise product of a vector and another vector.
+
+    If b is a number, a is scaled by it. The out argument is as for
+    add().
+
+    """
+    return _apply(a, b, out, 'mul', 'scale')
+
+def div(a, b, out=None):
+    """Find the elementwise quotient of a vector and another vector.
+
+    If b is a number, a is scaled by its reciprocal. The quotient of
+    integer vectors has typecode 'd'. The out argument is as for add().
+
+    """
+    return _apply(a, b, out, 'div', 'scale',
+                  scalar_transform=_reciprocal, true_division=True)
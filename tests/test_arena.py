@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+"""Tests for arena allocation of vectors in python-gsl."""
+
+# Copyright © 2016 Timothy Pederick.
+#
+# Based on the GNU Scientific Library (GSL):
+#     Copyright © 1996, 1997, 1998, 1999, 2000, 2001, 2002, 2003, 2004, 2005,
+#     2006, 2007, 2008, 2009, 2010, 2011, 2012, 2013, 2014, 2015 The GSL Team.
+#
+# This file is part of python-gsl.
+#
+# python-gsl is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-gsl is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with python-gsl. If not, see <http://www.gnu.org/licenses/>.
+# Standard library imports.
+from ctypes import addressof
+import gc
+import unittest
+import weakref
+
+# Library to be tested.
+from gsl import arena
+
+# Test dependency.
+from gsl import memory
+
+def data_address(v):
+    """Find the address of a vector's data."""
+    return addressof(v._v_p.contents.data.contents)
+
+# Test cases.
+class TestArena(unittest.TestCase):
+    """Test carving vectors out of an arena."""
+    def test_vector(self):
+        """Test making vectors from an arena."""
+        with arena.Arena(1024) as a:
+            u = a.vector(3)
+            self.assertEqual(list(u), [0.0, 0.0, 0.0])
+            v = a.vector(2, typecode='C')
+            w = a.empty(5, typecode='B')
+            self.assertEqual(len(w), 5)
+
+            # The vectors are laid out one after another, aligned.
+            self.assertEqual(data_address(v) - data_address(u),
+                             arena.ALIGNMENT * 2)
+            self.assertEqual(data_address(w) - data_address(v), 2 * 16)
+            self.assertEqual(a.used, 2 * arena.ALIGNMENT + 2 * 16 + 5)
+
+            # They work like any others.
+            u[0] = 1.5
+            self.assertEqual(list(u * 2), [3.0, 0.0, 0.0])
+
+    def test_single_allocation(self):
+        """Test that an arena allocates its memory once."""
+        gc.collect()
+        memory.reset()
+        with arena.Arena(1024) as a:
+            for _ in range(10):
+                a.vector(4)
+            self.assertEqual(memory.stats()['allocs'], 1)
+
+    def test_full(self):
+        """Test running out of room in an arena."""
+        with arena.Arena(64) as a:
+            a.vector(8)
+            with self.assertRaises(MemoryError):
+                a.vector(1)
+            with self.assertRaises(ValueError):
+                a.vector(1, typecode='?')
+
+    def test_reset(self):
+        """Test reusing an arena's memory after a reset."""
+        with arena.Arena(64) as a:
+            u = a.vector(8)
+            address = data_address(u)
+            a.reset()
+            self.assertTrue(u.closed)
+            self.assertEqual(a.used, 0)
+
+            v = a.vector(8)
+            self.assertEqual(data_address(v), address)
+
+            # Views of vectors from the arena prevent resetting.
+            view = v[2:4]
+            with self.assertRaises(BufferError):
+                a.reset()
+            self.assertFalse(v.closed)
+            view.close()
+            a.reset()
+
+            # So do consumers of the array interface.
+            w = a.vector(8)
+            interface = w.__array_interface__
+            with self.assertRaises(BufferError):
+                a.reset()
+            del interface
+            a.reset()
+
+    def test_close(self):
+        """Test closing an arena."""
+        a = arena.Arena(64)
+        u = a.vector(4)
+        a.close()
+        self.assertTrue(a.closed)
+        self.assertTrue(u.closed)
+        with self.assertRaises(ValueError):
+            a.vector(1)
+
+        # Closing again does nothing.
+        a.close()
+
+    def test_lifetime(self):
+        """Test that vectors keep their arena alive."""
+        a = arena.Arena(64)
+        u = a.vector(4)
+        arena_ref = weakref.ref(a)
+        del a
+        gc.collect()
+        self.assertIsNotNone(arena_ref())
+        del u
+        gc.collect()
+        self.assertIsNone(arena_ref())
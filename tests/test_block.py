@@ -31,11 +31,17 @@ import unittest
 from gsl import block
 
 # Test dependency.
-from gsl import gsl_complex
+from gsl import gsl_complex, gsl_complex_float
 
 # Data types supported.
 typecodes = {'d': (float, float, 0.0),
-             'C': (gsl_complex, complex, 0+0j)}
+             'C': (gsl_complex, complex, 0+0j),
+             'f': (float, float, 0.0),
+             'F': (gsl_complex_float, complex, 0+0j),
+             'i': (int, int, 0),
+             'l': (int, int, 0),
+             'B': (int, int, 0),
+             'h': (int, int, 0)}
 
 # Test cases.
 class TestBlock(unittest.TestCase):
@@ -101,3 +107,32 @@ class TestBlock(unittest.TestCase):
                 self.assertEqual(conversion(my_block.data[i]), initval)
 
             block.free(my_block_p, typecode=typecode)
+
+class TestBlockClass(unittest.TestCase):
+    """Test the Block class in python-gsl."""
+    BLOCK_SIZE = 10
+
+    def test_init(self):
+        """Test creating blocks."""
+        for typecode in typecodes:
+            _, conversion, initval = typecodes[typecode]
+            my_block = block.Block(self.BLOCK_SIZE, typecode=typecode)
+            self.assertEqual(len(my_block), self.BLOCK_SIZE)
+            self.assertEqual(my_block.typecode, typecode)
+            data = my_block._block_p.contents.data
+            for i in range(self.BLOCK_SIZE):
+                self.assertEqual(conversion(data[i]), initval)
+
+        with self.assertRaises(ValueError):
+            block.Block(self.BLOCK_SIZE, typecode='?')
+
+    def test_close(self):
+        """Test closing a block."""
+        with block.Block(self.BLOCK_SIZE) as my_block:
+            self.assertFalse(my_block.closed)
+        self.assertTrue(my_block.closed)
+        with self.assertRaises(ValueError):
+            len(my_block)
+
+        # Closing again does nothing.
+        my_block.close()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+"""Tests for finalization of native objects in python-gsl."""
+
+# Copyright © 2016 Timothy Pederick.
+#
+# Based on the GNU Scientific Library (GSL):
+#     Copyright © 1996, 1997, 1998, 1999, 2000, 2001, 2002, 2003, 2004, 2005,
+#     2006, 2007, 2008, 2009, 2010, 2011, 2012, 2013, 2014, 2015 The GSL Team.
+#
+# This file is part of python-gsl.
+#
+# python-gsl is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-gsl is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with python-gsl. If not, see <http://www.gnu.org/licenses/>.
+# Standard library imports.
+import gc
+import threading
+import unittest
+
+# Library to be tested.
+from gsl import finalize
+
+class Owner:
+    """An object to own items for finalization."""
+    pass
+
+# Test cases.
+class TestFinalize(unittest.TestCase):
+    """Test tracking objects for finalization."""
+    def setUp(self):
+        """Prepare a record of finalized items."""
+        self.finalized = []
+
+    def test_collect(self):
+        """Test that finalizers run when their owners are collected."""
+        owner = Owner()
+        finalize.track_for_finalization(owner, 'item',
+                                        self.finalized.append)
+        self.assertEqual(self.finalized, [])
+        del owner
+        gc.collect()
+        self.assertEqual(self.finalized, ['item'])
+
+    def test_finalize_now(self):
+        """Test that finalizers can be run early, but only once."""
+        owner = Owner()
+        ref = finalize.track_for_finalization(owner, 'item',
+                                              self.finalized.append)
+        finalize.finalize_now(ref)
+        self.assertEqual(self.finalized, ['item'])
+        finalize.finalize_now(ref)
+        del owner
+        gc.collect()
+        self.assertEqual(self.finalized, ['item'])
+
+    def test_deferred(self):
+        """Test that finalizers can be deferred and run in batches."""
+        finalize.enable_deferred(batch_size=3)
+        self.addCleanup(finalize.disable_deferred)
+
+        owners = [Owner() for _ in range(4)]
+        for i, owner in enumerate(owners):
+            finalize.track_for_finalization(owner, i, self.finalized.append)
+        del owner
+        for _ in range(2):
+            owners.pop()
+        self.assertEqual(self.finalized, [])
+        self.assertEqual(finalize.pending(), 2)
+
+        # Filling the batch runs the whole batch.
+        owners.pop()
+        self.assertEqual(sorted(self.finalized), [1, 2, 3])
+        self.assertEqual(finalize.pending(), 0)
+
+        owners.pop()
+        self.assertEqual(finalize.pending(), 1)
+        finalize.flush()
+        self.assertEqual(sorted(self.finalized), [0, 1, 2, 3])
+
+    def test_deferred_background(self):
+        """Test running deferred finalizers in a background thread."""
+        done = threading.Event()
+        def finalizer(item):
+            self.finalized.append(item)
+            if len(self.finalized) == 2:
+                done.set()
+
+        finalize.enable_deferred(batch_size=2, background=True)
+        self.addCleanup(finalize.disable_deferred)
+        for i in range(2):
+            finalize.track_for_finalization(Owner(), i, finalizer)
+        self.assertTrue(done.wait(5))
+        self.assertEqual(sorted(self.finalized), [0, 1])
+
+    def test_disable_deferred(self):
+        """Test that turning deferral off runs waiting finalizers."""
+        finalize.enable_deferred(batch_size=10)
+        finalize.track_for_finalization(Owner(), 'item',
+                                        self.finalized.append)
+        self.assertEqual(self.finalized, [])
+        finalize.disable_deferred()
+        self.assertEqual(self.finalized, ['item'])
+
+    def test_critical_section(self):
+        """Test that finalizers wait for critical sections to end."""
+        outer = finalize.CriticalSection()
+        inner = finalize.CriticalSection()
+        with outer:
+            with inner:
+                owner = Owner()
+                finalize.track_for_finalization(owner, 'item',
+                                                self.finalized.append)
+                del owner
+                gc.collect()
+            # Still in the outer section.
+            self.assertEqual(self.finalized, [])
+        self.assertEqual(self.finalized, ['item'])
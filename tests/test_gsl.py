@@ -43,3 +43,11 @@ class TestComplex(unittest.TestCase):
         a = gsl.gsl_complex((3.0, 0.5))
         b = 3.0 + 0.5j
         self.assertEqual(complex(a), b)
+
+    def test_float(self):
+        """Test conversion to and from the single-precision complex type."""
+        a = gsl.gsl_complex_float((3.0, 0.5))
+        b = gsl.gsl_complex_float.from_complex(3.0 + 0.5j)
+        self.assertEqual(a, b)
+        self.assertEqual(complex(a), 3.0 + 0.5j)
+        self.assertNotEqual(a, gsl.gsl_complex((3.0, 0.5)))
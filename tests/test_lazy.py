@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+"""Tests for lazy evaluation of vector expressions in python-gsl."""
+
+# Copyright © 2016 Timothy Pederick.
+#
+# Based on the GNU Scientific Library (GSL):
+#     Copyright © 1996, 1997, 1998, 1999, 2000, 2001, 2002, 2003, 2004, 2005,
+#     2006, 2007, 2008, 2009, 2010, 2011, 2012, 2013, 2014, 2015 The GSL Team.
+#
+# This file is part of python-gsl.
+#
+# python-gsl is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-gsl is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with python-gsl. If not, see <http://www.gnu.org/licenses/>.
+# Standard library imports.
+import gc
+import unittest
+
+# Library to be tested.
+from gsl import lazy
+
+# Test dependencies.
+from gsl import memory, vector
+
+# Test cases.
+class TestLazy(unittest.TestCase):
+    """Test lazily evaluated vector expressions."""
+    def setUp(self):
+        self.a = vector.Vector((1.0, 2.0, 3.0))
+        self.b = vector.Vector((10.0, 20.0, 30.0))
+        self.c = vector.Vector((100.0, 200.0, 300.0))
+
+    def test_sum(self):
+        """Test evaluating a sum of vectors."""
+        expr = lazy.lazy(self.a) + self.b + self.c
+        self.assertIsInstance(expr, lazy.Expression)
+        self.assertEqual(len(expr), 3)
+        self.assertEqual(expr.evaluate(), self.a + self.b + self.c)
+
+    def test_linear(self):
+        """Test evaluating linear combinations of vectors and numbers."""
+        a, b, c = self.a, self.b, self.c
+        expr = 2 * lazy.lazy(a) - b / 10 + (c - 1) * 0.5 - a
+        self.assertTrue(expr.evaluate().allclose(
+            2 * a - b / 10 + (c - 1) * 0.5 - a))
+        self.assertEqual((c - lazy.lazy(a)).evaluate(), c - a)
+        self.assertEqual((1 - lazy.lazy(a)).evaluate(), 1 - a)
+        self.assertEqual((-lazy.lazy(a)).evaluate(), -a)
+
+        # Everything can cancel out.
+        self.assertEqual((lazy.lazy(a) - a).evaluate(), vector.Vector(3))
+
+    def test_cancelled(self):
+        """Test expressions that cancel out, for other typecodes."""
+        for typecode in ('C', 'F', 'i', 'l', 'B', 'h'):
+            a = vector.Vector((1, 2, 3), typecode=typecode)
+            result = (lazy.lazy(a) - a).evaluate()
+            self.assertEqual(result._typecode, typecode)
+            self.assertEqual(result.tolist(), [0, 0, 0])
+
+            # Including into a destination with something already in it.
+            out = vector.Vector((4, 5, 6), typecode=typecode)
+            (2 * lazy.lazy(a) - a * 2).evaluate(out=out)
+            self.assertEqual(out.tolist(), [0, 0, 0])
+
+    def test_nonlinear(self):
+        """Test that products of vectors can't be lazy."""
+        with self.assertRaises(TypeError):
+            lazy.lazy(self.a) * self.b
+        with self.assertRaises(TypeError):
+            self.b * lazy.lazy(self.a)
+        with self.assertRaises(TypeError):
+            lazy.lazy([1.0, 2.0])
+
+    def test_typecodes(self):
+        """Test that lazy results have the same typecode as eager ones."""
+        i = vector.Vector((1, 2, 3), typecode='i')
+        f = vector.Vector((0.5, 1.5, 2.5), typecode='f')
+
+        result = (lazy.lazy(i) + i * 3 - i).evaluate()
+        self.assertEqual(result._typecode, 'i')
+        self.assertEqual(result, i * 3)
+        self.assertEqual((lazy.lazy(i) / 2).evaluate()._typecode, 'd')
+        self.assertEqual((lazy.lazy(i) + f).evaluate(), i + f)
+        result = (lazy.lazy(f) * 1j).evaluate()
+        self.assertEqual(result._typecode, 'F')
+        self.assertEqual(result, f * 1j)
+
+    def test_out(self):
+        """Test evaluating into a given vector."""
+        a, b = self.a, self.b
+        out = vector.Vector(3)
+        self.assertIs((lazy.lazy(a) + b).evaluate(out=out), out)
+        self.assertEqual(out, a + b)
+
+        # The destination can be one of the operands.
+        expected = b * 2 + a
+        (lazy.lazy(a) + b * 2).evaluate(out=a)
+        self.assertEqual(a, expected)
+
+        with self.assertRaises(TypeError):
+            (lazy.lazy(a) + b).evaluate(out=vector.Vector(3, typecode='f'))
+        with self.assertRaises(TypeError):
+            (lazy.lazy(a) + b).evaluate(out=vector.Vector(4))
+        with self.assertRaises(TypeError):
+            lazy.lazy(a) + vector.Vector(4)
+
+    def test_chunks(self):
+        """Test evaluating vectors longer than one chunk."""
+        size = lazy.CHUNK_SIZE * 2 + 5
+        a = vector.Vector(range(size))
+        b = vector.Vector(range(size), typecode='h')
+        self.assertEqual((lazy.lazy(a) + b + 1).evaluate(), a + b + 1)
+        self.assertEqual((lazy.lazy(b) * 3 - b * 2).evaluate(), b)
+
+    def test_no_temporaries(self):
+        """Test that evaluation makes only the result vector."""
+        expr = lazy.lazy(self.a) + self.b + self.c + self.a * 2
+        gc.collect()
+        memory.reset()
+        expr.evaluate()
+        self.assertEqual(memory.stats()['allocs'], 1)
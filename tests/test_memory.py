@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+
+"""Tests for native memory accounting in python-gsl."""
+
+# Copyright © 2016 Timothy Pederick.
+#
+# Based on the GNU Scientific Library (GSL):
+#     Copyright © 1996, 1997, 1998, 1999, 2000, 2001, 2002, 2003, 2004, 2005,
+#     2006, 2007, 2008, 2009, 2010, 2011, 2012, 2013, 2014, 2015 The GSL Team.
+#
+# This file is part of python-gsl.
+#
+# python-gsl is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-gsl is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with python-gsl. If not, see <http://www.gnu.org/licenses/>.
+# Standard library imports.
+from ctypes import ArgumentError
+import gc
+import threading
+import unittest
+
+# Library to be tested.
+from gsl import memory
+
+# Test dependencies.
+from gsl import block, pool, vector
+
+# Test cases.
+class TestMemory(unittest.TestCase):
+    """Test the accounting of native memory."""
+    def setUp(self):
+        """Start counting afresh."""
+        gc.collect()
+        memory.reset()
+        self.start = memory.stats()
+
+    def test_vector(self):
+        """Test accounting for vector memory."""
+        v = vector.Vector(10)
+        w = vector.Vector(5, typecode='C')
+        stats = memory.stats()
+        self.assertEqual(stats['current_bytes'] - self.start['current_bytes'],
+                         10 * 8 + 5 * 16)
+        self.assertEqual(stats['allocs'], 2)
+        self.assertEqual(stats['live'].get('C', 0) -
+                         self.start['live'].get('C', 0), 1)
+
+        # Views don't allocate memory.
+        u = v[2:5]
+        self.assertEqual(memory.stats()['allocs'], 2)
+
+        del u, v
+        w.close()
+        gc.collect()
+        stats = memory.stats()
+        self.assertEqual(stats['current_bytes'], self.start['current_bytes'])
+        self.assertEqual(stats['peak_bytes'],
+                         self.start['current_bytes'] + 10 * 8 + 5 * 16)
+        self.assertEqual(stats['frees'], 2)
+
+    def test_block(self):
+        """Test accounting for block memory."""
+        block_p = block.alloc(4, typecode='f')
+        self.assertEqual(memory.stats()['current_bytes'] -
+                         self.start['current_bytes'], 4 * 4)
+        block.free(block_p, typecode='f')
+        self.assertEqual(memory.stats()['current_bytes'],
+                         self.start['current_bytes'])
+
+    def test_pool(self):
+        """Test that memory held by the pool still counts."""
+        pool.enable()
+        self.addCleanup(pool.disable)
+        v = vector.Vector(3)
+        del v
+        gc.collect()
+        self.assertEqual(memory.stats()['current_bytes'] -
+                         self.start['current_bytes'], 4 * 8)
+        pool.clear()
+        self.assertEqual(memory.stats()['current_bytes'],
+                         self.start['current_bytes'])
+
+    def test_reset(self):
+        """Test resetting the counts."""
+        v = vector.Vector(10)
+        del v
+        gc.collect()
+        memory.reset()
+        stats = memory.stats()
+        self.assertEqual(stats['allocs'], 0)
+        self.assertEqual(stats['frees'], 0)
+        self.assertEqual(stats['peak_bytes'], stats['current_bytes'])
+
+    def test_budget(self):
+        """Test that going over budget fails before allocating."""
+        memory.set_budget(self.start['current_bytes'] + 100)
+        self.addCleanup(memory.set_budget, None)
+        self.assertEqual(memory.get_budget(),
+                         self.start['current_bytes'] + 100)
+
+        v = vector.Vector(10)
+        with self.assertRaises(MemoryError):
+            w = vector.Vector(10)
+        with self.assertRaises(MemoryError):
+            block_p = block.alloc(10)
+        # Neither failed allocation is counted.
+        stats = memory.stats()
+        self.assertEqual(stats['allocs'], 1)
+        self.assertEqual(stats['current_bytes'] - self.start['current_bytes'],
+                         10 * 8)
+
+        # Freeing memory makes room again.
+        v.close()
+        w = vector.Vector(10)
+        w.close()
+
+        with self.assertRaises(ValueError):
+            memory.set_budget(-1)
+
+    def test_thread_budget(self):
+        """Test a budget for the current thread."""
+        self.assertIsNone(memory.get_thread_budget())
+        memory.set_thread_budget(100)
+        self.addCleanup(memory.set_thread_budget, None)
+        self.assertEqual(memory.get_thread_budget(), 100)
+
+        v = vector.Vector(10)
+        self.assertEqual(memory.thread_bytes(), 10 * 8)
+        with self.assertRaises(MemoryError):
+            w = vector.Vector(5)
+        self.assertEqual(memory.thread_bytes(), 10 * 8)
+
+        # The charge is given back when the vector is freed.
+        del v
+        gc.collect()
+        self.assertEqual(memory.thread_bytes(), 0)
+        w = vector.Vector(5)
+        self.assertEqual(memory.thread_bytes(), 5 * 8)
+        w.close()
+        self.assertEqual(memory.thread_bytes(), 0)
+
+    def test_failed_init(self):
+        """Test that vectors whose elements can't be set are freed."""
+        memory.set_thread_budget(100)
+        self.addCleanup(memory.set_thread_budget, None)
+        with self.assertRaises(ArgumentError):
+            vector.Vector([1.0, 'x'], typecode='d')
+        gc.collect()
+        self.assertEqual(memory.thread_bytes(), 0)
+        self.assertEqual(memory.stats()['current_bytes'],
+                         self.start['current_bytes'])
+
+    def test_thread_budget_other_threads(self):
+        """Test that a thread's budget doesn't apply to other threads."""
+        memory.set_thread_budget(0)
+        self.addCleanup(memory.set_thread_budget, None)
+        with self.assertRaises(MemoryError):
+            v = vector.Vector(1)
+
+        results = []
+        def make_vector():
+            results.append(memory.get_thread_budget())
+            results.append(len(vector.Vector(1)))
+        t = threading.Thread(target=make_vector)
+        t.start()
+        t.join()
+        self.assertEqual(results, [None, 1])
+
+    def test_collect_in_critical_section(self):
+        """Test collecting vectors while the memory state is locked."""
+        class Node:
+            def __init__(self, vector):
+                self.cycle = self
+                self.vector = vector
+
+        def churn():
+            # With this threshold, each cycle is collected by the allocations
+            # that stats() makes while holding the lock.
+            for _ in range(100):
+                Node(vector.Vector(16))
+                memory.stats()
+
+        threshold = gc.get_threshold()
+        gc.set_threshold(2)
+        self.addCleanup(gc.set_threshold, *threshold)
+        t = threading.Thread(target=churn, daemon=True)
+        t.start()
+        t.join(10)
+        self.assertFalse(t.is_alive(), 'deadlocked')
+        gc.collect()
+        self.assertEqual(memory.stats()['current_bytes'],
+                         self.start['current_bytes'])
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+"""Tests for pooling of freed vector memory in python-gsl."""
+
+# Copyright © 2016 Timothy Pederick.
+#
+# Based on the GNU Scientific Library (GSL):
+#     Copyright © 1996, 1997, 1998, 1999, 2000, 2001, 2002, 2003, 2004, 2005,
+#     2006, 2007, 2008, 2009, 2010, 2011, 2012, 2013, 2014, 2015 The GSL Team.
+#
+# This file is part of python-gsl.
+#
+# python-gsl is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-gsl is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with python-gsl. If not, see <http://www.gnu.org/licenses/>.
+# Standard library imports.
+from ctypes import addressof
+import gc
+import threading
+import unittest
+
+# Library to be tested.
+from gsl import pool
+
+# Test dependencies.
+from gsl import memory, vector
+
+def data_address(v):
+    """Find the address of a vector's data."""
+    return addressof(v._v_p.contents.data.contents)
+
+# Test cases.
+class TestPool(unittest.TestCase):
+    """Test the vector memory pool."""
+    def setUp(self):
+        """Turn pooling on for each test."""
+        pool.enable(max_bytes=1024)
+        self.addCleanup(pool.disable)
+
+    def test_reuse(self):
+        """Test that freed vectors are reused by vectors of similar size."""
+        v = vector.Vector((1.0, 2.0, 3.0))
+        address = data_address(v)
+        del v
+        gc.collect()
+        self.assertEqual(pool.held_bytes(), 4 * 8)
+
+        # Sizes 3 and 4 are in the same size class, and reused memory is
+        # still zeroed when it should be.
+        w = vector.Vector(4)
+        self.assertEqual(data_address(w), address)
+        self.assertEqual(len(w), 4)
+        self.assertEqual(w.tolist(), [0.0] * 4)
+        self.assertEqual(pool.held_bytes(), 0)
+
+    def test_typecodes(self):
+        """Test that vectors are only reused for the same typecode."""
+        v = vector.Vector(2, typecode='C')
+        del v
+        gc.collect()
+
+        w = vector.Vector(2)
+        self.assertEqual(pool.held_bytes(), 2 * 16)
+        z = vector.Vector(2, typecode='C')
+        self.assertEqual(pool.held_bytes(), 0)
+
+    def test_cap(self):
+        """Test that the pool holds no more memory than its cap."""
+        vectors = [vector.Vector(64) for _ in range(3)]
+        del vectors
+        gc.collect()
+        self.assertEqual(pool.held_bytes(), 2 * 64 * 8)
+
+        pool.enable(max_bytes=512)
+        self.assertEqual(pool.held_bytes(), 512)
+
+        pool.clear()
+        self.assertTrue(pool.is_enabled())
+        self.assertEqual(pool.held_bytes(), 0)
+
+    def test_oversized(self):
+        """Test that vectors too big for the pool aren't rounded up."""
+        # 200 doubles would round up to 256, which is more than 1024 bytes.
+        v = vector.Vector(200)
+        self.assertEqual(v._v_p.contents.block.contents.size, 200)
+        w = vector.Vector(200, typecode='B')
+        self.assertEqual(w._v_p.contents.block.contents.size, 256)
+
+    def test_thread_budget(self):
+        """Test that pooled vectors are charged for their capacity."""
+        memory.set_thread_budget(1024)
+        self.addCleanup(memory.set_thread_budget, None)
+        v = vector.Vector(3)
+        self.assertEqual(memory.thread_bytes(), 4 * 8)
+        del v
+        gc.collect()
+        self.assertEqual(memory.thread_bytes(), 0)
+
+        # Reused vectors are charged the same way.
+        w = vector.Vector(3)
+        self.assertEqual(memory.thread_bytes(), 4 * 8)
+        w.close()
+        self.assertEqual(memory.thread_bytes(), 0)
+
+    def test_disable(self):
+        """Test that disabling the pool frees the memory it holds."""
+        v = vector.Vector(8)
+        del v
+        gc.collect()
+        pool.disable()
+        self.assertFalse(pool.is_enabled())
+        self.assertEqual(pool.held_bytes(), 0)
+
+        v = vector.Vector(3)
+        self.assertEqual(v._v_p.contents.block.contents.size, 3)
+
+    def test_collect_in_critical_section(self):
+        """Test collecting vectors while the pool is locked."""
+        class Node:
+            def __init__(self, vector):
+                self.cycle = self
+                self.vector = vector
+
+        def collect_locked():
+            Node(vector.Vector(16))
+            # Stands in for a collection run by an allocation in the pool's
+            # critical sections, which releases the vector there.
+            with pool._lock:
+                gc.collect()
+                held = pool.held_bytes()
+            results.append((held, pool.held_bytes()))
+
+        results = []
+        t = threading.Thread(target=collect_locked, daemon=True)
+        t.start()
+        t.join(10)
+        self.assertFalse(t.is_alive(), 'deadlocked')
+        # The vector was only released once the lock was.
+        self.assertEqual(results, [(0, 16 * 8)])
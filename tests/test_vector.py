@@ -24,17 +24,33 @@
 # along with python-gsl. If not, see <http://www.gnu.org/licenses/>.
 
 # Standard library imports.
+import array
 import copy
 from ctypes import ArgumentError
+import gc
 from math import sqrt
+import os
+import pickle
+import struct
+import tempfile
 import unittest
+import weakref
 
 # Library to be tested.
 from gsl import vector
 
+# Test dependency.
+from gsl import block
+
 # Data types supported.
 typecodes = {'d': (float, 0.0),
-             'C': (complex, 0+0j)}
+             'C': (complex, 0+0j),
+             'f': (float, 0.0),
+             'F': (complex, 0+0j),
+             'i': (int, 0),
+             'l': (int, 0),
+             'B': (int, 0),
+             'h': (int, 0)}
 
 # Test cases.
 class TestVectorMemory(unittest.TestCase):
@@ -76,6 +92,20 @@ class TestVectorMemory(unittest.TestCase):
             self.assertIsInstance(x, float)
             self.assertEqual(x, 0.0)
 
+    def test_empty(self):
+        """Test creation of an uninitialised vector."""
+        for typecode in typecodes:
+            v = vector.Vector.empty(self.VECTOR_SIZE, typecode=typecode)
+            self.assertEqual(len(v), self.VECTOR_SIZE)
+            self.assertEqual(v._typecode, typecode)
+
+        with self.assertRaises(ValueError):
+            v = vector.Vector.empty(self.VECTOR_SIZE, typecode='?')
+
+        # Vectors have no per-instance dictionary.
+        with self.assertRaises(AttributeError):
+            v.extra = None
+
     def test_init_by_type(self):
         """Test creation of a vector with a typecode."""
         for typecode in typecodes:
@@ -276,6 +306,86 @@ class TestVectorOperations(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.w + self.z
 
+    def test_astype(self):
+        """Test conversion of vectors to other typecodes."""
+        w = self.u.astype('C')
+        self.assertEqual(w._typecode, 'C')
+        self.assertEqual(w.tolist(), [3+0j, 0j, -1+0j])
+
+        u = self.w.astype('d')
+        self.assertEqual(u._typecode, 'd')
+        self.assertEqual(u.tolist(), [2.0, -2.0, 1.0])
+
+        # Converting to the same typecode still makes a copy.
+        u = self.u.astype('d')
+        self.assertIsNot(u, self.u)
+        self.assertEqual(u.tolist(), self.u.tolist())
+
+        with self.assertRaises(ValueError):
+            self.u.astype('This is not a valid type code.')
+
+    def test_add_scalar(self):
+        """Test addition of vectors and numbers."""
+        self.assertEqual((self.u + 1).tolist(), [4.0, 1.0, 0.0])
+        self.assertEqual((1 + self.u).tolist(), [4.0, 1.0, 0.0])
+        self.assertEqual((self.w + 1j).tolist(), [2+2j, -2+2j, 1-1j])
+
+        # Adding a complex number to a real vector coerces the result.
+        vector_sum = self.u + 1j
+        self.assertEqual(vector_sum._typecode, 'C')
+        self.assertEqual(vector_sum.tolist(), [3+1j, 1j, -1+1j])
+
+    def test_sub(self):
+        """Test subtraction of vectors and numbers."""
+        self.assertEqual((self.u - self.v).tolist(), [4.0, -1.0, -1.5])
+        self.assertEqual((self.w - self.x).tolist(), [2+2j, -1+1j, 1-2j])
+        self.assertEqual((self.u - self.x).tolist(), [3+1j, 1+0j, -1+0j])
+        self.assertEqual((self.u - 1).tolist(), [2.0, -1.0, -2.0])
+        self.assertEqual((1 - self.u).tolist(), [-2.0, 1.0, 2.0])
+        with self.assertRaises(TypeError):
+            self.u - self.y
+
+    def test_mul(self):
+        """Test elementwise multiplication of vectors, and scaling."""
+        self.assertEqual((self.u * self.v).tolist(), [-3.0, 0.0, -0.5])
+        self.assertEqual((self.w * self.x).tolist(), [1-2j, 2-1j, 0j])
+        self.assertEqual((self.u * 2).tolist(), [6.0, 0.0, -2.0])
+        self.assertEqual((2 * self.u).tolist(), [6.0, 0.0, -2.0])
+        self.assertEqual((self.u * 1j).tolist(), [3j, 0j, -1j])
+        self.assertEqual((-self.u).tolist(), [-3.0, 0.0, 1.0])
+        with self.assertRaises(TypeError):
+            self.w * self.z
+
+    def test_div(self):
+        """Test elementwise division of vectors, and scaling."""
+        self.assertEqual((self.u / self.v).tolist(), [-3.0, 0.0, -2.0])
+        self.assertEqual((self.w / self.w).tolist(), [1+0j, 1+0j, 1+0j])
+        self.assertEqual((self.u / 2).tolist(), [1.5, 0.0, -0.5])
+        self.assertEqual((3 / self.v).tolist(), [-3.0, 3.0, 6.0])
+        with self.assertRaises(ZeroDivisionError):
+            self.u / 0
+
+    def test_in_place_operators(self):
+        """Test in-place subtraction, multiplication and division."""
+        u = self.u
+        u -= self.v
+        u *= 2
+        u /= self.u[:]
+        self.assertIs(u, self.u)
+        self.assertEqual(u.tolist(), [1.0, 1.0, 1.0])
+
+        # Coercion to another typecode gives a new vector.
+        u *= 1j
+        self.assertIsNot(u, self.u)
+        self.assertEqual(u.tolist(), [1j, 1j, 1j])
+
+    def test_unsupported_operand(self):
+        """Test whether combining a vector with a non-number fails."""
+        with self.assertRaises(TypeError):
+            self.u + 'string'
+        with self.assertRaises(TypeError):
+            'string' - self.u
+
     def test_iadd_real(self):
         """Test in-place addition of one real vector to another."""
         self.u += self.v
@@ -325,3 +435,927 @@ class TestVectorOperations(unittest.TestCase):
             self.u += self.y
         with self.assertRaises(TypeError):
             self.w += self.z
+
+
+class TestVectorBuffer(unittest.TestCase):
+    """Test exporting vector data without copying it."""
+    def test_buffer_real(self):
+        """Test the buffer of a real vector."""
+        values = (-1.0, 3.0, 0.5)
+        v = vector.Vector(values)
+        view = v.buffer()
+
+        # Does the buffer describe the data correctly?
+        self.assertEqual(view.format, 'd')
+        self.assertEqual(view.shape, (3,))
+        self.assertEqual(view.tolist(), list(values))
+
+        # Do writes through the buffer reach the vector?
+        view[1] = 2.5
+        self.assertEqual(v[1], 2.5)
+
+    def test_buffer_complex(self):
+        """Test the buffer of a complex vector."""
+        v = vector.Vector((3.0-0.5j, 0.1j))
+        view = v.buffer()
+
+        # Is each element split into its real and imaginary parts?
+        self.assertEqual(view.format, 'd')
+        self.assertEqual(view.shape, (2, 2))
+        self.assertEqual(view.tolist(), [[3.0, -0.5], [0.0, 0.1]])
+
+    def test_buffer_keeps_vector(self):
+        """Test that the buffer outlives the vector object it came from."""
+        view = vector.Vector((1.0, 2.0)).buffer()
+        self.assertEqual(view.tolist(), [1.0, 2.0])
+
+    def test_array_interface(self):
+        """Test the NumPy array interface description."""
+        v = vector.Vector(4, typecode='C')
+        interface = v.__array_interface__
+        self.assertEqual(interface['shape'], (4,))
+        self.assertEqual(interface['strides'], (16,))
+        self.assertTrue(interface['typestr'].endswith('c16'))
+
+    def test_array_interface_close(self):
+        """Test that vectors can't be closed while their data is exported."""
+        v = vector.Vector((1.0, 2.0, 3.0))
+        interface = v.__array_interface__
+        with self.assertRaises(BufferError):
+            v.close()
+        self.assertEqual(list(memoryview(interface['data']).cast('B')
+                              .cast('d')), [1.0, 2.0, 3.0])
+        del interface
+        v.close()
+        self.assertTrue(v.closed)
+
+
+class TestVectorBulkInit(unittest.TestCase):
+    """Test creation of vectors from buffers, in bulk."""
+    def test_init_from_array(self):
+        """Test creation of a vector from a typed array."""
+        values = array.array('d', (-1.0, 3.0, 0.0))
+        v = vector.Vector(values)
+
+        # Is it the right size and type, with the right values?
+        self.assertEqual(len(v), len(values))
+        self.assertEqual(v._typecode, 'd')
+        for expected, got in zip(values, v):
+            self.assertEqual(expected, got)
+
+    def test_init_from_bytes(self):
+        """Test creation of a vector from bytes, as unsigned chars."""
+        v = vector.Vector(bytes((1, 2, 3)))
+        self.assertEqual(v._typecode, 'B')
+        self.assertEqual(v.tolist(), [1, 2, 3])
+
+        v = vector.Vector(array.array('B', (1, 2)))
+        self.assertEqual(v._typecode, 'B')
+        self.assertEqual(v.tolist(), [1, 2])
+
+        # With another typecode, the bytes are converted one by one.
+        w = vector.Vector(bytes((1, 2, 3)), typecode='d')
+        self.assertEqual(w.tolist(), [1.0, 2.0, 3.0])
+
+    def test_init_from_multidimensional(self):
+        """Test that only one-dimensional buffers are copied in bulk."""
+        values = array.array('d', (1.0, 2.0, 3.0, 4.0))
+        square = memoryview(values).cast('B').cast('d', [2, 2])
+        self.assertIsNone(vector._buffer_for_init(square))
+        scalar = memoryview(values).cast('B')[:8].cast('d', [])
+        self.assertIsNone(vector._buffer_for_init(scalar))
+
+        # Complex vectors' own buffers are two-dimensional.
+        z = vector.Vector((1+2j, 3j))
+        self.assertEqual(vector.Vector(z).tolist(), [1+2j, 3j])
+
+    def test_init_from_signed_chars(self):
+        """Test creation from a buffer format with no matching typecode."""
+        # This should fall back to initialising from an iterable.
+        values = (1, -2, 3, 4, 5, 6, 7, 8)
+        v = vector.Vector(array.array('b', values))
+        self.assertEqual(v._typecode, 'd')
+        self.assertEqual(v.tolist(), list(values))
+
+    def test_init_from_memoryview(self):
+        """Test creation of a vector from a non-contiguous memoryview."""
+        values = array.array('d', (1.0, 2.0, 3.0, 4.0, 5.0))
+        v = vector.Vector(memoryview(values)[::2])
+        for expected, got in zip((1.0, 3.0, 5.0), v):
+            self.assertEqual(expected, got)
+
+    def test_init_from_buffer_mismatch(self):
+        """Test creation from a buffer that does not match the typecode."""
+        # This should fall back to initialising from an iterable.
+        v = vector.Vector(array.array('i', (1, 2)), typecode='C')
+        self.assertEqual(v[0], 1+0j)
+        self.assertEqual(v[1], 2+0j)
+
+
+class TestVectorBulkExport(unittest.TestCase):
+    """Test exporting the values in vectors, in bulk."""
+    def setUp(self):
+        """Prepare a real and a complex vector for use in tests."""
+        self.real_values = (-1.0, 3.0, 0.5)
+        self.complex_values = (3.0-0.5j, 0.1j)
+        self.u = vector.Vector(self.real_values)
+        self.w = vector.Vector(self.complex_values)
+
+    def test_iter(self):
+        """Test iterating over vectors."""
+        self.assertEqual(tuple(iter(self.u)), self.real_values)
+        self.assertEqual(tuple(iter(self.w)), self.complex_values)
+
+    def test_tolist(self):
+        """Test exporting vectors as lists."""
+        self.assertEqual(self.u.tolist(), list(self.real_values))
+
+        values = self.w.tolist()
+        self.assertEqual(values, list(self.complex_values))
+        for val in values:
+            self.assertIsInstance(val, complex)
+
+    def test_tobytes(self):
+        """Test exporting vectors as bytes."""
+        self.assertEqual(self.u.tobytes(),
+                         struct.pack('=3d', *self.real_values))
+        self.assertEqual(self.w.tobytes(),
+                         struct.pack('=4d', 3.0, -0.5, 0.0, 0.1))
+
+    def test_toarray(self):
+        """Test exporting vectors as arrays."""
+        self.assertEqual(self.u.toarray(),
+                         array.array('d', self.real_values))
+        self.assertEqual(self.w.toarray(),
+                         array.array('d', (3.0, -0.5, 0.0, 0.1)))
+
+
+class TestVectorViews(unittest.TestCase):
+    """Test views of parts of vectors."""
+    def setUp(self):
+        """Prepare a real and a complex vector for use in tests."""
+        self.u = vector.Vector((0.0, 1.0, 2.0, 3.0, 4.0, 5.0))
+        self.w = vector.Vector((1+1j, 2-1j, 3+0j, -1j))
+
+    def test_slice(self):
+        """Test a contiguous slice of a vector."""
+        view = self.u[1:4]
+        self.assertIsInstance(view, vector.Vector)
+        self.assertEqual(len(view), 3)
+        self.assertEqual(view.tolist(), [1.0, 2.0, 3.0])
+
+        view = self.w[2:]
+        self.assertEqual(view.tolist(), [3+0j, -1j])
+
+    def test_slice_with_step(self):
+        """Test a strided slice of a vector, and a slice of that slice."""
+        view = self.u[1::2]
+        self.assertEqual(view.tolist(), [1.0, 3.0, 5.0])
+        self.assertEqual(view[1:].tolist(), [3.0, 5.0])
+        self.assertEqual(view[::2].tolist(), [1.0, 5.0])
+
+    def test_slice_empty(self):
+        """Test an empty slice of a vector."""
+        self.assertEqual(len(self.u[3:3]), 0)
+        self.assertEqual(self.u[3:3].tolist(), [])
+
+    def test_slice_negative_step(self):
+        """Test whether a reversed slice generates an error."""
+        with self.assertRaises(ValueError):
+            self.u[::-1]
+
+    def test_slice_shares_memory(self):
+        """Test whether changes to a view reach the original vector."""
+        view = self.u[::3]
+        view[1] = -3.0
+        self.assertEqual(self.u[3], -3.0)
+
+        self.w[1:3][0] = 0j
+        self.assertEqual(self.w[1], 0j)
+
+    def test_slice_keeps_parent(self):
+        """Test whether a view outlives the vector it came from."""
+        view = vector.Vector((0.5, 1.5, 2.5))[1:]
+        self.assertEqual(view.tolist(), [1.5, 2.5])
+
+    def test_slice_operations(self):
+        """Test vector operations on views."""
+        view = self.u[1::2]
+        self.assertAlmostEqual(abs(view), sqrt(35))
+        self.assertEqual(view.dot(self.u[:3]), 13.0)
+
+        vector_sum = view + self.u[:3]
+        self.assertEqual(vector_sum.tolist(), [1.0, 4.0, 7.0])
+
+        view += self.u[:3]
+        self.assertEqual(self.u.tolist(), [0.0, 1.0, 2.0, 4.0, 4.0, 7.0])
+
+    def test_real_imag(self):
+        """Test views of the real and imaginary parts of a complex vector."""
+        real, imag = self.w.real, self.w.imag
+        self.assertEqual(real._typecode, 'd')
+        self.assertEqual(real.tolist(), [1.0, 2.0, 3.0, 0.0])
+        self.assertEqual(imag.tolist(), [1.0, -1.0, 0.0, -1.0])
+
+        # Do real vector operations work on the parts?
+        self.assertAlmostEqual(abs(imag), sqrt(3))
+        self.assertEqual(real.dot(imag), -1.0)
+
+        # Do changes to the parts reach the original vector?
+        imag[2] = 4.0
+        self.assertEqual(self.w[2], 3+4j)
+
+    def test_real_imag_of_real(self):
+        """Test the real and imaginary parts of a real vector."""
+        self.assertIs(self.u.real, self.u)
+        self.assertEqual(self.u.imag.tolist(), [0.0] * len(self.u))
+
+
+class TestVectorFromFile(unittest.TestCase):
+    """Test vectors backed by memory-mapped files."""
+    def setUp(self):
+        """Prepare a file of raw vector data."""
+        self.values = (1.0, -2.0, 0.5, 4.0)
+        handle, self.path = tempfile.mkstemp()
+        with os.fdopen(handle, 'wb') as f:
+            f.write(struct.pack('=4d', *self.values))
+
+    def tearDown(self):
+        """Clean up the data file."""
+        os.remove(self.path)
+
+    def read_file(self):
+        """Get the values currently stored in the data file."""
+        with open(self.path, 'rb') as f:
+            return struct.unpack('=4d', f.read())
+
+    def test_from_file(self):
+        """Test reading a whole file as a vector."""
+        v = vector.Vector.from_file(self.path)
+        self.assertEqual(v.tolist(), list(self.values))
+
+    def test_from_file_range(self):
+        """Test reading part of a file as a vector."""
+        v = vector.Vector.from_file(self.path, offset=8, length=2)
+        self.assertEqual(v.tolist(), [-2.0, 0.5])
+
+        w = vector.Vector.from_file(self.path, typecode='C', offset=16)
+        self.assertEqual(w.tolist(), [0.5+4j])
+
+    def test_from_file_too_long(self):
+        """Test whether reading beyond the end of a file generates an error."""
+        with self.assertRaises(ValueError):
+            vector.Vector.from_file(self.path, offset=8, length=4)
+
+    def test_from_file_write(self):
+        """Test writing changes back to a file."""
+        v = vector.Vector.from_file(self.path, mode='r+')
+        v[0] = 3.0
+        del v
+        self.assertEqual(self.read_file(), (3.0,) + self.values[1:])
+
+    def test_from_file_copy_on_write(self):
+        """Test keeping changes out of a file."""
+        v = vector.Vector.from_file(self.path, mode='c')
+        v[0] = 3.0
+        self.assertEqual(v[0], 3.0)
+        self.assertEqual(self.read_file(), self.values)
+
+
+class TestVectorPickle(unittest.TestCase):
+    """Test pickling and unpickling of vectors."""
+    def setUp(self):
+        """Prepare a real and a complex vector for use in tests."""
+        self.u = vector.Vector((3.0, 0.0, -1.0, 2.5))
+        self.w = vector.Vector((2+1j, -2+1j, 1-2j), typecode='C')
+
+    def test_pickle(self):
+        """Test pickling vectors with every protocol."""
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            for v in (self.u, self.w, self.u[::2]):
+                v2 = pickle.loads(pickle.dumps(v, protocol=protocol))
+                self.assertIsInstance(v2, vector.Vector)
+                self.assertEqual(v2._typecode, v._typecode)
+                self.assertEqual(v2.tolist(), v.tolist())
+
+    @unittest.skipIf(pickle.HIGHEST_PROTOCOL < 5, 'requires protocol 5')
+    def test_pickle_out_of_band(self):
+        """Test pickling vectors with out-of-band buffers."""
+        for v in (self.u, self.w):
+            buffers = []
+            data = pickle.dumps(v, protocol=5,
+                                buffer_callback=buffers.append)
+            self.assertEqual(len(buffers), 1)
+
+            v2 = pickle.loads(data, buffers=buffers)
+            self.assertEqual(v2.tolist(), v.tolist())
+
+            # The unpickled vector must not share memory with the original.
+            v2[0] = 0
+            self.assertNotEqual(v2[0], v[0])
+
+
+class TestVectorFunctions(unittest.TestCase):
+    """Test the functional forms of vector operations."""
+    def setUp(self):
+        """Prepare vectors for use in tests."""
+        self.u = vector.Vector((3.0, 0.0, -1.0))
+        self.v = vector.Vector((-1.0, 1.0, 0.5))
+        self.w = vector.Vector((2+1j, -2+1j, 1-2j), typecode='C')
+        self.y = vector.Vector((2.5, 0.5, -1.0, 1.0))
+
+    def test_functions(self):
+        """Test the functions without a destination vector."""
+        self.assertEqual(vector.add(self.u, self.v).tolist(),
+                         [2.0, 1.0, -0.5])
+        self.assertEqual(vector.sub(self.u, 1).tolist(), [2.0, -1.0, -2.0])
+        self.assertEqual(vector.mul(self.u, self.v).tolist(),
+                         [-3.0, 0.0, -0.5])
+        self.assertEqual(vector.div(self.u, 2).tolist(), [1.5, 0.0, -0.5])
+
+    def test_out(self):
+        """Test writing results into a destination vector."""
+        out = vector.Vector(3)
+        result = vector.add(self.u, self.v, out=out)
+        self.assertIs(result, out)
+        self.assertEqual(out.tolist(), [2.0, 1.0, -0.5])
+
+        # The operands must not be changed.
+        self.assertEqual(self.u.tolist(), [3.0, 0.0, -1.0])
+        self.assertEqual(self.v.tolist(), [-1.0, 1.0, 0.5])
+
+        # Destinations can be reused, and can be views.
+        vector.mul(self.u, 2, out=out)
+        self.assertEqual(out.tolist(), [6.0, 0.0, -2.0])
+        big = vector.Vector(6)
+        vector.sub(self.u, self.v, out=big[::2])
+        self.assertEqual(big.tolist(), [4.0, 0.0, -1.0, 0.0, -1.5, 0.0])
+
+    def test_out_coerced(self):
+        """Test writing mixed-type results into a destination vector."""
+        out = vector.Vector(3, typecode='C')
+        vector.add(self.u, self.w, out=out)
+        self.assertEqual(out.tolist(), [5+1j, -2+1j, 0-2j])
+
+    def test_out_aliased(self):
+        """Test using an operand as the destination vector."""
+        vector.sub(self.u, self.v, out=self.u)
+        self.assertEqual(self.u.tolist(), [4.0, -1.0, -1.5])
+        vector.div(self.u, self.v, out=self.v)
+        self.assertEqual(self.v.tolist(), [-4.0, -1.0, -3.0])
+
+    def test_out_mismatch(self):
+        """Test whether an unsuitable destination vector fails."""
+        with self.assertRaises(TypeError):
+            vector.add(self.u, self.v, out=vector.Vector(4))
+        with self.assertRaises(TypeError):
+            vector.add(self.u, self.w, out=vector.Vector(3))
+        with self.assertRaises(TypeError):
+            vector.add(self.u, self.y, out=vector.Vector(3))
+        with self.assertRaises(TypeError):
+            vector.add(self.u, self.v, out=[0.0, 0.0, 0.0])
+        with self.assertRaises(TypeError):
+            vector.add(self.u, 'string')
+
+
+class TestVectorBLAS(unittest.TestCase):
+    """Test BLAS level 1 operations on vectors."""
+    def setUp(self):
+        """Prepare vectors for use in tests."""
+        self.u = vector.Vector((3.0, 0.0, -1.0))
+        self.v = vector.Vector((-1.0, 1.0, 0.5))
+        self.w = vector.Vector((2+1j, -2+1j, 1-2j), typecode='C')
+        self.x = vector.Vector((0-1j, -1+0j, 0+0j), typecode='C')
+        self.y = vector.Vector((2.5, 0.5, -1.0, 1.0))
+
+    def test_axpy(self):
+        """Test adding a multiple of one vector to another."""
+        self.u.axpy(2, self.v)
+        self.assertEqual(self.u.tolist(), [1.0, 2.0, 0.0])
+
+        self.w.axpy(1j, self.x)
+        self.assertEqual(self.w.tolist(), [3+1j, -2+0j, 1-2j])
+
+        # Real vectors can be added to complex ones, but not the reverse.
+        self.w.axpy(-1, self.v)
+        self.assertEqual(self.w.tolist(), [4+1j, -3+0j, 0.5-2j])
+        with self.assertRaises(TypeError):
+            self.v.axpy(1, self.w)
+        with self.assertRaises(TypeError):
+            self.v.axpy(1j, self.u)
+        with self.assertRaises(TypeError):
+            self.u.axpy(1, self.y)
+
+    def test_scale(self):
+        """Test scaling a vector in place."""
+        self.u.scale(-2)
+        self.assertEqual(self.u.tolist(), [-6.0, 0.0, 2.0])
+
+        self.w.scale(2)
+        self.assertEqual(self.w.tolist(), [4+2j, -4+2j, 2-4j])
+        self.w.scale(1j)
+        self.assertEqual(self.w.tolist(), [-2+4j, -2-4j, 4+2j])
+
+        with self.assertRaises(TypeError):
+            self.u.scale(1j)
+
+    def test_asum(self):
+        """Test the sum of absolute values of a vector's elements."""
+        self.assertEqual(self.u.asum(), 4.0)
+        self.assertEqual(self.w.asum(), 9.0)
+
+    def test_iamax(self):
+        """Test finding the element with the largest absolute value."""
+        self.assertEqual(self.u.iamax(), 0)
+        self.assertEqual(self.v.iamax(), 0)
+        self.assertEqual(self.x.iamax(), 0)
+
+    def test_swap(self):
+        """Test exchanging the elements of two vectors."""
+        self.u.swap(self.v)
+        self.assertEqual(self.u.tolist(), [-1.0, 1.0, 0.5])
+        self.assertEqual(self.v.tolist(), [3.0, 0.0, -1.0])
+
+        with self.assertRaises(TypeError):
+            self.u.swap(self.w)
+        with self.assertRaises(TypeError):
+            self.u.swap(self.y)
+
+    def test_copy_from(self):
+        """Test copying the elements of one vector into another."""
+        self.u.copy_from(self.v)
+        self.assertEqual(self.u.tolist(), [-1.0, 1.0, 0.5])
+
+        self.w.copy_from(self.v)
+        self.assertEqual(self.w.tolist(), [-1+0j, 1+0j, 0.5+0j])
+
+        with self.assertRaises(TypeError):
+            self.u.copy_from(self.x)
+        with self.assertRaises(TypeError):
+            self.u.copy_from(self.y)
+
+
+class TestVectorReductions(unittest.TestCase):
+    """Test reductions of vectors to single values."""
+    def setUp(self):
+        """Prepare vectors for use in tests."""
+        self.u = vector.Vector((3.0, 0.0, -1.0, 3.0, -1.0))
+        self.w = vector.Vector((2+1j, -2+1j, 1-2j), typecode='C')
+
+    def test_sum(self):
+        """Test the sum of a vector's elements."""
+        self.assertEqual(self.u.sum(), 4.0)
+        self.assertEqual(self.w.sum(), 1+0j)
+        self.assertEqual(self.u[1::2].sum(), 3.0)
+
+    def test_min_max(self):
+        """Test the smallest and largest of a vector's elements."""
+        self.assertEqual(self.u.min(), -1.0)
+        self.assertEqual(self.u.max(), 3.0)
+        self.assertEqual(self.u.minmax(), (-1.0, 3.0))
+        self.assertEqual(self.u.argmin(), 2)
+        self.assertEqual(self.u.argmax(), 0)
+
+    def test_min_max_unordered(self):
+        """Test whether complex vectors fail to give a minimum or maximum."""
+        with self.assertRaises(TypeError):
+            self.w.min()
+        with self.assertRaises(TypeError):
+            self.w.argmax()
+
+    def test_min_max_empty(self):
+        """Test whether empty vectors fail to give a minimum or maximum."""
+        with self.assertRaises(ValueError):
+            self.u[:0].max()
+        with self.assertRaises(ValueError):
+            self.u[:0].minmax()
+
+    def test_isnull_ispos(self):
+        """Test checks on all of a vector's elements."""
+        self.assertFalse(self.u.isnull())
+        self.assertFalse(self.u.ispos())
+        self.assertTrue(vector.Vector(3).isnull())
+        self.assertTrue(vector.Vector(3, typecode='C').isnull())
+        self.assertTrue(self.u[::3].ispos())
+        self.assertFalse(self.w.ispos())
+
+
+class TestVectorFloat(unittest.TestCase):
+    """Test single-precision vectors."""
+    def setUp(self):
+        """Prepare vectors for use in tests."""
+        self.a = vector.Vector(array.array('f', (3.0, 0.0, -1.0)))
+        self.b = vector.Vector((-1.0, 1.0, 0.5), typecode='f')
+        self.u = vector.Vector((0.25, 2.0, 4.0))
+
+    def test_init(self):
+        """Test creation of single-precision vectors."""
+        self.assertEqual(self.a._typecode, 'f')
+        self.assertEqual(self.a.tolist(), [3.0, 0.0, -1.0])
+        self.assertEqual(self.b.tolist(), [-1.0, 1.0, 0.5])
+        self.assertEqual(self.a.buffer().format, 'f')
+        self.assertEqual(self.a.toarray(), array.array('f', (3.0, 0.0, -1.0)))
+
+    def test_operations(self):
+        """Test operations on single-precision vectors."""
+        self.assertEqual((self.a + self.b).tolist(), [2.0, 1.0, -0.5])
+        self.assertEqual((self.a * 2)._typecode, 'f')
+        self.assertEqual(self.a @ self.b, -3.5)
+        self.assertAlmostEqual(abs(self.a), sqrt(10), places=6)
+        self.assertEqual(self.a.sum(), 2.0)
+        self.assertEqual(self.a.minmax(), (-1.0, 3.0))
+        self.a.axpy(2, self.b)
+        self.assertEqual(self.a.tolist(), [1.0, 2.0, 0.0])
+
+    def test_mixed(self):
+        """Test operations mixing single- and double-precision vectors."""
+        vector_sum = self.a + self.u
+        self.assertEqual(vector_sum._typecode, 'd')
+        self.assertEqual(vector_sum.tolist(), [3.25, 2.0, 3.0])
+
+        vector_sum = self.b + 1j
+        self.assertEqual(vector_sum._typecode, 'F')
+        self.assertEqual(vector_sum.tolist(), [-1+1j, 1+1j, 0.5+1j])
+
+        with self.assertRaises(TypeError):
+            self.a.axpy(1, self.u)
+
+    def test_astype(self):
+        """Test conversion to and from single precision."""
+        u = self.a.astype('d')
+        self.assertEqual(u._typecode, 'd')
+        self.assertEqual(u.tolist(), [3.0, 0.0, -1.0])
+
+        a = vector.Vector((0.1, 1e300)).astype('f')
+        self.assertEqual(a._typecode, 'f')
+        self.assertEqual(a.tolist(), list(array.array('f', (0.1, 1e300))))
+
+        w = self.b[::2].astype('C')
+        self.assertEqual(w.tolist(), [-1+0j, 0.5+0j])
+
+
+class TestVectorInteger(unittest.TestCase):
+    """Test integer vectors."""
+    def setUp(self):
+        """Prepare vectors for use in tests."""
+        self.a = vector.Vector(array.array('i', (3, 0, -1)))
+        self.b = vector.Vector((-1, 1, 2), typecode='l')
+        self.c = vector.Vector(bytes((200, 100, 1)), typecode='B')
+        self.u = vector.Vector((0.25, 2.0, 4.0))
+
+    def test_init(self):
+        """Test creation of integer vectors."""
+        self.assertEqual(self.a._typecode, 'i')
+        self.assertEqual(self.a.tolist(), [3, 0, -1])
+        self.assertEqual(self.a.buffer().format, 'i')
+        self.assertEqual(self.b[2], 2)
+        self.assertEqual(self.c.tolist(), [200, 100, 1])
+        self.assertEqual(self.c.tobytes(), bytes((200, 100, 1)))
+
+        h = vector.Vector(array.array('h', (1, -2)))
+        self.assertEqual(h._typecode, 'h')
+        self.assertEqual(h.toarray(), array.array('h', (1, -2)))
+
+    def test_operations(self):
+        """Test operations on integer vectors."""
+        vector_sum = self.a + self.a
+        self.assertEqual(vector_sum._typecode, 'i')
+        self.assertEqual(vector_sum.tolist(), [6, 0, -2])
+        self.assertEqual((self.a * 3).tolist(), [9, 0, -3])
+        self.assertEqual((self.a - 1).tolist(), [2, -1, -2])
+        self.assertEqual((-self.a).tolist(), [-3, 0, 1])
+
+        self.a.scale(2)
+        self.assertEqual(self.a.tolist(), [6, 0, -2])
+        with self.assertRaises(TypeError):
+            self.a.scale(0.5)
+
+        # BLAS operations are only available for floating-point vectors.
+        with self.assertRaises(TypeError):
+            self.a.axpy(2, self.a)
+
+    def test_reductions(self):
+        """Test reductions of integer vectors."""
+        self.assertEqual(self.a.sum(), 2)
+        self.assertEqual(self.a.minmax(), (-1, 3))
+        self.assertEqual(self.b.argmax(), 2)
+        self.assertFalse(self.b.ispos())
+        self.assertTrue(self.c.ispos())
+
+        # Unsigned char vectors are summed without overflowing.
+        self.assertEqual(self.c.sum(), 301)
+
+    def test_promotion(self):
+        """Test operations that promote integer vectors."""
+        vector_sum = self.a + self.b
+        self.assertEqual(vector_sum._typecode, 'l')
+        self.assertEqual(vector_sum.tolist(), [2, 1, 1])
+
+        vector_sum = self.a + self.u
+        self.assertEqual(vector_sum._typecode, 'd')
+        self.assertEqual(vector_sum.tolist(), [3.25, 2.0, 3.0])
+
+        self.assertEqual((self.a * 0.5).tolist(), [1.5, 0.0, -0.5])
+        self.assertEqual((self.a + 1j)._typecode, 'C')
+
+        # True division always gives real numbers.
+        quotient = self.a / 2
+        self.assertEqual(quotient._typecode, 'd')
+        self.assertEqual(quotient.tolist(), [1.5, 0.0, -0.5])
+        quotient = self.b / vector.Vector((2, 4, 1), typecode='i')
+        self.assertEqual(quotient._typecode, 'd')
+        self.assertEqual(quotient.tolist(), [-0.5, 0.25, 2.0])
+
+        self.assertEqual(self.a @ self.b, -5.0)
+        self.assertEqual(abs(vector.Vector((3, 4), typecode='h')), 5.0)
+
+        a = self.a
+        a += 0.5
+        self.assertEqual(a._typecode, 'd')
+        self.assertEqual(self.a._typecode, 'i')
+
+    def test_astype(self):
+        """Test conversion to and from integer vectors."""
+        a = vector.Vector((2.75, -1.5)).astype('i')
+        self.assertEqual(a._typecode, 'i')
+        self.assertEqual(a.tolist(), [2, -1])
+
+        self.assertEqual(self.c.astype('h').tolist(), [200, 100, 1])
+        with self.assertRaises(OverflowError):
+            self.b.astype('B')
+
+
+class TestVectorComplexFloat(unittest.TestCase):
+    """Test single-precision complex vectors."""
+    def setUp(self):
+        """Prepare vectors for use in tests."""
+        self.z = vector.Vector((1+2j, -0.5j, 3), typecode='F')
+        self.a = vector.Vector((3.0, 0.0, -1.0), typecode='f')
+        self.w = vector.Vector((2j, -2, 1))
+
+    def test_init(self):
+        """Test creation of single-precision complex vectors."""
+        self.assertEqual(self.z._typecode, 'F')
+        self.assertEqual(self.z.tolist(), [1+2j, -0.5j, 3+0j])
+        self.assertEqual(self.z[1], -0.5j)
+        self.assertEqual(self.z.buffer().format, 'f')
+        self.assertEqual(self.z.buffer().shape, (3, 2))
+
+        z = pickle.loads(pickle.dumps(self.z))
+        self.assertEqual(z.tolist(), self.z.tolist())
+
+    def test_parts(self):
+        """Test the real and imaginary parts of single-precision vectors."""
+        self.assertEqual(self.z.real._typecode, 'f')
+        self.assertEqual(self.z.real.tolist(), [1.0, 0.0, 3.0])
+        self.assertEqual(self.z.imag.tolist(), [2.0, -0.5, 0.0])
+        self.assertEqual(self.z.sum(), 4+1.5j)
+
+    def test_operations(self):
+        """Test operations on single-precision complex vectors."""
+        self.assertEqual((self.z * 2j).tolist(), [-4+2j, 1+0j, 6j])
+        self.assertEqual((self.z * 2j)._typecode, 'F')
+        self.assertEqual(self.z @ self.z, 5.75+4j)
+        self.assertAlmostEqual(abs(self.z), sqrt(14.25), places=6)
+
+        self.z.scale(2)
+        self.assertEqual(self.z.tolist(), [2+4j, -1j, 6+0j])
+        self.z.axpy(1j, self.a)
+        self.assertEqual(self.z.tolist(), [2+7j, -1j, 6-1j])
+        self.assertEqual(self.z.iamax(), 0)
+
+    def test_coercion(self):
+        """Test coercion to and from single-precision complex vectors."""
+        vector_sum = self.z + self.a
+        self.assertEqual(vector_sum._typecode, 'F')
+        self.assertEqual(vector_sum.tolist(), [4+2j, -0.5j, 2+0j])
+
+        vector_sum = self.z + self.w
+        self.assertEqual(vector_sum._typecode, 'C')
+        self.assertEqual(vector_sum.tolist(), [1+4j, -2-0.5j, 4+0j])
+
+        vector_sum = self.z + vector.Vector((1.0, 1.0, 1.0))
+        self.assertEqual(vector_sum._typecode, 'C')
+
+        self.assertEqual(self.z.astype('C').tolist(), self.z.tolist())
+        self.assertEqual(self.w.astype('F').tolist(), self.w.tolist())
+        self.assertEqual(self.z.astype('f').tolist(), [1.0, 0.0, 3.0])
+
+
+class TestVectorClose(unittest.TestCase):
+    """Test freeing vectors' memory deterministically."""
+    def test_close(self):
+        """Test closing a vector."""
+        u = vector.Vector((1.0, 2.0, 3.0))
+        self.assertFalse(u.closed)
+        u.close()
+        self.assertTrue(u.closed)
+
+        with self.assertRaises(ValueError):
+            len(u)
+        with self.assertRaises(ValueError):
+            u[0]
+        with self.assertRaises(ValueError):
+            u + 1
+
+        # Closing again does nothing.
+        u.close()
+
+    def test_context_manager(self):
+        """Test using a vector as a context manager."""
+        with vector.Vector((1.0, 2.0, 3.0)) as u:
+            self.assertEqual(u.sum(), 6.0)
+        self.assertTrue(u.closed)
+
+    def test_close_exports(self):
+        """Test closing vectors that have views or buffers."""
+        u = vector.Vector((1.0, 2.0, 3.0))
+        view = u[1:]
+        with self.assertRaises(BufferError):
+            u.close()
+
+        # Closed views no longer count.
+        with view:
+            pass
+        u.close()
+
+        u = vector.Vector((1.0, 2.0, 3.0))
+        data = u.buffer()
+        with self.assertRaises(BufferError):
+            u.close()
+        del data
+        u.close()
+        self.assertTrue(u.closed)
+
+class TestVectorFromBlock(unittest.TestCase):
+    """Test vectors that share the memory of a block."""
+    def test_interleaved(self):
+        """Test vectors of interleaved channels in one block."""
+        shared = block.Block(6)
+        left = vector.Vector.from_block(shared, 0, 3, 2)
+        right = vector.Vector.from_block(shared, offset=1, stride=2)
+        self.assertEqual(len(left), 3)
+        self.assertEqual(len(right), 3)
+
+        for i in range(3):
+            left[i] = i + 1.0
+            right[i] = i + 4.0
+        whole = vector.Vector.from_block(shared)
+        self.assertEqual(list(whole), [1.0, 4.0, 2.0, 5.0, 3.0, 6.0])
+
+        # The vectors work like any others.
+        self.assertEqual(list(left + right), [5.0, 7.0, 9.0])
+
+    def test_typecode(self):
+        """Test that vectors take the typecode of their block."""
+        shared = block.Block(4, typecode='i')
+        v = vector.Vector.from_block(shared, 1, 2)
+        self.assertEqual(v._typecode, 'i')
+        v[1] = 7
+        self.assertEqual(list(vector.Vector.from_block(shared)), [0, 0, 7, 0])
+
+    def test_bad_range(self):
+        """Test vectors that don't fit in their block."""
+        shared = block.Block(4)
+        with self.assertRaises(ValueError):
+            vector.Vector.from_block(shared, 2, 3)
+        with self.assertRaises(ValueError):
+            vector.Vector.from_block(shared, 0, 3, 2)
+        with self.assertRaises(ValueError):
+            vector.Vector.from_block(shared, 5)
+        with self.assertRaises(ValueError):
+            vector.Vector.from_block(shared, 0, 2, 0)
+        with self.assertRaises(TypeError):
+            vector.Vector.from_block(vector.Vector(4))
+
+    def test_lifetime(self):
+        """Test that vectors keep their block alive."""
+        shared = block.Block(4)
+        v = vector.Vector.from_block(shared)
+        block_ref = weakref.ref(shared)
+        del shared
+        gc.collect()
+        self.assertIsNotNone(block_ref())
+        v[3] = 1.5
+        self.assertEqual(v[3], 1.5)
+
+        del v
+        gc.collect()
+        self.assertIsNone(block_ref())
+
+    def test_close(self):
+        """Test closing blocks and the vectors made from them."""
+        shared = block.Block(4)
+        v = vector.Vector.from_block(shared)
+        with self.assertRaises(BufferError):
+            shared.close()
+        v.close()
+        shared.close()
+        self.assertTrue(shared.closed)
+
+class TestVectorCompare(unittest.TestCase):
+    """Test comparing vectors."""
+    def test_eq(self):
+        """Test comparing vectors for equality."""
+        for typecode in typecodes:
+            u = vector.Vector((1, 2, 3), typecode=typecode)
+            v = vector.Vector((1, 2, 3), typecode=typecode)
+            self.assertTrue(u == v)
+            self.assertFalse(u != v)
+            v[2] = 4
+            self.assertFalse(u == v)
+            self.assertTrue(u != v)
+
+        # Views and strided vectors compare by their elements.
+        u = vector.Vector((1.0, 2.0, 1.0, 2.0))
+        self.assertEqual(u[:2], u[2:])
+        self.assertEqual(u[::2], vector.Vector((1.0, 1.0)))
+
+    def test_eq_mixed(self):
+        """Test comparing vectors of different typecodes and lengths."""
+        self.assertEqual(vector.Vector((1, 2), typecode='i'),
+                         vector.Vector((1.0, 2.0)))
+        self.assertEqual(vector.Vector((1.5, 2.0), typecode='f'),
+                         vector.Vector((1.5+0j, 2.0+0j)))
+        self.assertNotEqual(vector.Vector((1.0, 2.0)),
+                            vector.Vector((1.0, 2.0, 3.0)))
+        self.assertNotEqual(vector.Vector((1.0, 2.0)), [1.0, 2.0])
+
+    def test_unhashable(self):
+        """Test that vectors can't be hashed."""
+        with self.assertRaises(TypeError):
+            hash(vector.Vector(3))
+
+    def test_allclose(self):
+        """Test comparing vectors within a tolerance."""
+        u = vector.Vector((1.0, 100.0, -5.0))
+        self.assertTrue(u.allclose(u))
+        self.assertTrue(u.allclose(vector.Vector((1.000001, 100.0, -5.0))))
+        self.assertFalse(u.allclose(vector.Vector((1.1, 100.0, -5.0))))
+        # The tolerance is relative to the other vector's elements.
+        self.assertTrue(u.allclose(vector.Vector((1.0, 100.0005, -5.0))))
+        self.assertFalse(u.allclose(vector.Vector((1.0005, 100.0, -5.0))))
+        self.assertTrue(u.allclose(vector.Vector((1.1, 100.0, -5.0)),
+                                   rtol=0, atol=0.2))
+
+        nan = float('nan')
+        self.assertFalse(vector.Vector((1.0, nan)).allclose(
+            vector.Vector((1.0, nan))))
+
+    def test_allclose_scales(self):
+        """Test tolerance comparisons of elements of different sizes."""
+        # Each element's tolerance depends on its own size, not the others'.
+        u = vector.Vector((1e-6, 1e6, 1.0))
+        self.assertTrue(u.allclose(vector.Vector((1e-6, 1e6 + 5, 1.0))))
+        self.assertFalse(u.allclose(vector.Vector((1e-6 + 1e-7, 1e6, 1.0))))
+        self.assertFalse(u.allclose(vector.Vector((1e-6, 1e6 + 20, 1.0))))
+        # Differences between the bounds are settled exactly.
+        self.assertTrue(vector.Vector((1.0,)).allclose(
+            vector.Vector((1.19,)), rtol=0.1, atol=0.1))
+        self.assertFalse(vector.Vector((1.0,)).allclose(
+            vector.Vector((1.25,)), rtol=0.1, atol=0.1))
+        # Squares that overflow are also settled exactly.
+        self.assertTrue(vector.Vector((1e200,)).allclose(
+            vector.Vector((1e200 * (1 + 1e-6),))))
+        self.assertFalse(vector.Vector((3e38, 1.0), typecode='f').allclose(
+            vector.Vector((-3e38, 1.0), typecode='f')))
+
+    def test_allclose_infinite(self):
+        """Test tolerance comparisons of infinities."""
+        inf = float('inf')
+        # Infinities are only close to the same infinity.
+        self.assertFalse(vector.Vector((1.0,)).allclose(
+            vector.Vector((inf,))))
+        self.assertFalse(vector.Vector((inf,)).allclose(
+            vector.Vector((1.0,))))
+        self.assertFalse(vector.Vector((inf, 1.0)).allclose(
+            vector.Vector((-inf, 1.0))))
+        self.assertTrue(vector.Vector((inf, 1.0)).allclose(
+            vector.Vector((inf, 1.000001))))
+        self.assertTrue(vector.Vector((-inf, 2.0), typecode='f').allclose(
+            vector.Vector((-inf, 2.0))))
+        self.assertTrue(vector.Vector((complex(inf, 0), 1j)).allclose(
+            vector.Vector((complex(inf, 0), 1.000001j))))
+
+    def test_allclose_mixed(self):
+        """Test tolerance comparisons of other typecodes."""
+        u = vector.Vector((1+1j, 2-2j))
+        self.assertTrue(u.allclose(vector.Vector((1+1.000001j, 2-2j))))
+        self.assertFalse(u.allclose(vector.Vector((1+1.1j, 2-2j))))
+        self.assertTrue(vector.Vector((1, 2), typecode='i').allclose(
+            vector.Vector((1.000001, 2.0), typecode='f')))
+        self.assertFalse(vector.Vector((1, 2), typecode='B').allclose(
+            vector.Vector((2, 1), typecode='B')))
+        self.assertTrue(vector.Vector((100, 200), typecode='l').allclose(
+            vector.Vector((100, 200.001))))
+        self.assertFalse(vector.Vector((100, 200), typecode='h').allclose(
+            vector.Vector((100, 201), typecode='h')))
+        self.assertTrue(vector.Vector((1+1j, 2-2j), typecode='F').allclose(
+            vector.Vector((1+1j, 2-2.00001j))))
+        self.assertFalse(vector.Vector((1+1j, 2-2j), typecode='F').allclose(
+            vector.Vector((1+1j, 2-2.1j))))
+
+        with self.assertRaises(TypeError):
+            u.allclose(vector.Vector(3))
+        with self.assertRaises(TypeError):
+            u.allclose([1+1j, 2-2j])